@@ -0,0 +1,57 @@
+"""Compare decision diagrams with trees on large merged markers.
+
+Run from the repository root:
+
+    python -m benchmarks.bdd
+"""
+# built-in
+import random
+import time
+
+# project
+from dephell_markers import BDD, Markers
+
+
+def make_markers(count: int, seed: int = 42):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield Markers('python_version >= "3.{}" and python_version < "3.{}" and {} == "{}" or extra == "e{}"'.format(
+            rnd.randrange(0, 6),
+            rnd.randrange(6, 12),
+            rnd.choice(['os_name', 'sys_platform', 'platform_machine']),
+            rnd.choice(['nt', 'posix', 'linux', 'win32', 'x86_64']),
+            rnd.randrange(0, 20),
+        ))
+
+
+def run_trees(markers) -> float:
+    start = time.perf_counter()
+    left = Markers.union_all(markers).simplify()
+    right = Markers.union_all(reversed(markers)).simplify()
+    # equal strings prove equivalence, but different ones prove nothing
+    str(left) == str(right)  # noqa: B015
+    return time.perf_counter() - start
+
+
+def run_bdd(markers) -> float:
+    start = time.perf_counter()
+    bdd = BDD()
+    left = right = bdd.false
+    for marker in markers:
+        left |= bdd.from_markers(marker)
+    for marker in reversed(markers):
+        right |= bdd.from_markers(marker)
+    assert left is right
+    return time.perf_counter() - start
+
+
+def main():
+    for count in (10, 100, 1000):
+        markers = list(make_markers(count))
+        print('{:6} markers:  trees {:8.3f} s, bdd {:8.3f} s'.format(
+            count, run_trees(markers), run_bdd(markers),
+        ))
+
+
+if __name__ == '__main__':
+    main()
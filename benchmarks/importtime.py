@@ -0,0 +1,45 @@
+"""Measure time of `import dephell_markers` in a fresh interpreter.
+
+Run from the repository root:
+
+    python -m benchmarks.importtime
+"""
+# built-in
+import subprocess
+import sys
+
+
+# dependencies that must be imported only on the first use
+HEAVY = ('packaging.markers', 'packaging.specifiers', 'packaging.version', 'pyparsing', 'dephell_specifier', 'sqlite3')
+
+
+def measure() -> dict:
+    """Get cumulative import time in microseconds of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import dephell_markers'],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_time, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    runs = [measure() for _ in range(5)]
+    best = min(times['dephell_markers'] for times in runs)
+    print('import dephell_markers: {:8.2f} ms'.format(best / 1000))
+    heavy = sorted(name for name in runs[0] if name in HEAVY)
+    print('heavy dependencies:     {}'.format(', '.join(heavy) or 'none'))
+    if heavy:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Compare NumPy and pure Python implementations of `evaluate_matrix`.
+
+Run from the repository root:
+
+    python -m benchmarks.matrix
+"""
+# built-in
+import random
+import time
+from pathlib import Path
+
+# project
+from dephell_markers import Markers, evaluate_matrix
+
+
+CORPUS = [line for line in (Path(__file__).parent / 'corpus.txt').read_text().splitlines() if line]
+
+
+def make_environments(count: int, seed: int = 42):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        version = '3.{}.{}'.format(rnd.randrange(0, 12), rnd.randrange(0, 20))
+        yield dict(
+            os_name=rnd.choice(['posix', 'nt']),
+            sys_platform=rnd.choice(['linux', 'win32', 'darwin']),
+            platform_system=rnd.choice(['Linux', 'Windows', 'Darwin']),
+            platform_machine=rnd.choice(['x86_64', 'aarch64', 'i386']),
+            python_version=version.rsplit('.', 1)[0],
+            python_full_version=version,
+            extra=rnd.choice(['', 'dev', 'tests']),
+        )
+
+
+def run(markers, environments, use_numpy: bool) -> float:
+    start = time.perf_counter()
+    evaluate_matrix(markers, environments, use_numpy=use_numpy)
+    return time.perf_counter() - start
+
+
+def main():
+    markers = [Markers(line) for line in CORPUS]
+    # import NumPy before measurements
+    run(markers[:1], [{}], use_numpy=True)
+    for count in (100, 10000, 100000):
+        environments = list(make_environments(count))
+        print('{} markers x {:6} environments:  python {:8.3f} s, numpy {:8.3f} s'.format(
+            len(markers), count,
+            run(markers, environments, use_numpy=False),
+            run(markers, environments, use_numpy=True),
+        ))
+
+
+if __name__ == '__main__':
+    main()
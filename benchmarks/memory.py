@@ -0,0 +1,93 @@
+"""Measure memory used by parsed markers of the corpus.
+
+Single markers are compared with the previous representation:
+an instance `__dict__` with `packaging` nodes, like the `attrs` class had.
+
+Run from the repository root:
+
+    python -m benchmarks.memory
+"""
+# built-in
+import gc
+import tracemalloc
+from pathlib import Path
+
+# external
+from packaging.markers import Marker
+
+# project
+from dephell_markers._operation import Operation
+from dephell_markers._parser import parse
+
+
+CORPUS = [line for line in (Path(__file__).parent / 'corpus.txt').read_text().splitlines() if line]
+
+
+class DictLeaf:
+    """Single marker stored as before: `packaging` nodes in the instance `__dict__`.
+    """
+
+    def __init__(self, lhs, op, rhs):
+        self.lhs = lhs
+        self.op = op
+        self.rhs = rhs
+        self._hash = hash((lhs.value, op.value, rhs.value))
+
+
+def _flatten(markers):
+    for item in markers:
+        if isinstance(item, tuple):
+            yield item
+        elif isinstance(item, list):
+            yield from _flatten(item)
+
+
+def _walk(node):
+    if isinstance(node, Operation):
+        for child in node.nodes:
+            yield from _walk(child)
+    else:
+        yield node
+
+
+def make_trees() -> list:
+    return [parse(markers) for markers in CORPUS]
+
+
+def make_dict_leaves() -> list:
+    return [DictLeaf(*parts) for markers in CORPUS for parts in _flatten(Marker(markers)._markers)]
+
+
+def make_slotted_leaves() -> list:
+    return [leaf for markers in CORPUS for leaf in _walk(parse(markers))]
+
+
+def measure(make, copies: int = 100) -> int:
+    # warm up caches of parsers, so they aren't counted
+    make()
+    gc.collect()
+    tracemalloc.start()
+    objects = [make() for _ in range(copies)]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main():
+    copies = 100
+    total = copies * len(CORPUS)
+    size = measure(make_trees, copies=copies)
+    print('markers:   {:8}'.format(total))
+    print('memory:    {:8.1f} KiB'.format(size / 1024))
+    print('per tree:  {:8.1f} B'.format(size / total))
+
+    leaves = copies * len(make_slotted_leaves())
+    print('leaves:    {:8}'.format(leaves))
+    for name, make in (('dict', make_dict_leaves), ('slotted', make_slotted_leaves)):
+        size = measure(make, copies=copies)
+        print('{:8}   {:8.1f} B per leaf'.format(name + ':', size / leaves))
+
+
+if __name__ == '__main__':
+    main()
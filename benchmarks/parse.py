@@ -0,0 +1,45 @@
+"""Compare the built-in markers parser with the `packaging` pyparsing grammar.
+
+Run from the repository root:
+
+    python -m benchmarks.parse
+"""
+# built-in
+import timeit
+import warnings
+from pathlib import Path
+
+# project
+from dephell_markers import Markers
+from dephell_markers._parser import parse
+
+
+CORPUS = [line for line in (Path(__file__).parent / 'corpus.txt').read_text().splitlines() if line]
+
+
+def parse_pyparsing(markers: str):
+    # `packaging<22` only
+    from packaging import markers as packaging
+    return Markers._convert(packaging._coerce_parse_result(packaging.MARKER.parseString(markers)))
+
+
+def run(func, number: int = 20) -> float:
+    timer = timeit.Timer(lambda: [func(markers) for markers in CORPUS])
+    return min(timer.repeat(repeat=5, number=number)) / number / len(CORPUS)
+
+
+def main():
+    warnings.simplefilter('ignore')
+    new = run(parse)
+    print('built-in:  {:8.2f} us/marker'.format(new * 10 ** 6))
+    try:
+        old = run(parse_pyparsing)
+    except (ImportError, AttributeError):
+        print('pyparsing: not available in the installed `packaging`')
+        return
+    print('pyparsing: {:8.2f} us/marker'.format(old * 10 ** 6))
+    print('speedup:   {:8.2f}x'.format(old / new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Compare `parse_many` with parsing strings one by one.
+
+Run from the repository root:
+
+    python -m benchmarks.parse_many
+"""
+# built-in
+import os
+import time
+
+# project
+from dephell_markers import Markers, parse_many
+
+
+def make_strings(count: int):
+    # mostly unique strings, as in a big corpus of lockfiles
+    for index in range(count):
+        yield 'python_full_version >= "3.{}.{}" and (sys_platform == "linux" or extra == "e{}")'.format(
+            index % 17, index % 13, index,
+        )
+
+
+def main():
+    strings = list(make_strings(100000))
+
+    Markers.cache.clear()
+    start = time.perf_counter()
+    markers = [Markers(string) for string in strings]
+    print('one by one:        {:8.3f} s'.format(time.perf_counter() - start))
+
+    del markers
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        Markers.cache.clear()
+        start = time.perf_counter()
+        markers = parse_many(strings, workers=workers)
+        del markers
+        print('parse_many({:3}):   {:8.3f} s'.format(workers, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Stream markers from a big generated poetry.lock and measure time and peak memory.
+
+Run from the repository root:
+
+    python -m benchmarks.readers
+"""
+# built-in
+import time
+import tracemalloc
+
+# project
+from dephell_markers import read_poetry_lock
+
+
+def make_lock(packages: int):
+    for index in range(packages):
+        yield '[[package]]\n'
+        yield 'name = "package{}"\n'.format(index)
+        yield 'version = "1.0"\n'
+        yield '\n[package.dependencies]\n'
+        yield 'dep{} = {{version = "*", markers = "python_version >= \\"3.{}\\""}}\n'.format(index, index % 13)
+        yield 'other = {version = "*", markers = "sys_platform == \\"win32\\""}\n\n'
+
+
+def main():
+    for packages in (10000, 100000):
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = sum(1 for _ in read_poetry_lock(make_lock(packages)))
+        elapsed = time.perf_counter() - start
+        _size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print('{:7} pairs: {:6.2f} s, peak memory {:8.1f} KiB'.format(count, elapsed, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Compare `Markers.union_all` with `|=` in a loop.
+
+Run from the repository root:
+
+    python -m benchmarks.reduce
+"""
+# built-in
+import time
+
+# project
+from dephell_markers import Markers
+
+
+def make_markers(count: int):
+    for index in range(count):
+        yield Markers('python_full_version == "3.{}.{}" and extra == "e{}"'.format(
+            index % 13, index % 101, index % 997,
+        ))
+
+
+def run_loop(count: int) -> float:
+    markers = list(make_markers(count))
+    start = time.perf_counter()
+    result = Markers()
+    for marker in markers:
+        result |= marker
+    return time.perf_counter() - start
+
+
+def run_union_all(count: int) -> float:
+    markers = list(make_markers(count))
+    start = time.perf_counter()
+    Markers.union_all(markers)
+    return time.perf_counter() - start
+
+
+def main():
+    for count in (1000, 10000):
+        print('{:6} markers:  loop {:8.3f} s, union_all {:8.3f} s'.format(
+            count, run_loop(count), run_union_all(count),
+        ))
+
+
+if __name__ == '__main__':
+    main()
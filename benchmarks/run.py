@@ -0,0 +1,254 @@
+"""Run all benchmarks on the markers corpus and save results as JSON.
+
+Run from the repository root:
+
+    python -m benchmarks.run --output before.json
+    # ... change something ...
+    python -m benchmarks.run --output after.json --compare before.json
+
+Every case reports the best of several repeats, so results are stable enough
+to compare runs on the same machine. Nothing here needs network access.
+"""
+# built-in
+import argparse
+import json
+import platform
+import sys
+import timeit
+from copy import copy
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# project
+import dephell_markers
+from dephell_markers import Environments, Markers
+from dephell_markers._parser import parse
+
+# app
+from . import importtime, memory
+
+
+CORPUS = [line for line in (Path(__file__).parent / 'corpus.txt').read_text().splitlines() if line]
+ENVIRONMENTS = [
+    dict(os_name='nt', sys_platform='win32', platform_system='Windows', python_version='2.7'),
+    dict(os_name='posix', sys_platform='linux', platform_system='Linux', python_version='3.6'),
+    dict(os_name='posix', sys_platform='darwin', platform_system='Darwin', python_version='3.9'),
+]
+
+# name -> (function that makes the benchmarked function, number of items it handles, unit)
+CASES = dict()  # type: Dict[str, Tuple[Callable[[], Callable], int, str]]
+
+
+def case(name: str, items: int = len(CORPUS)):
+    def wrapper(setup: Callable[[], Callable]) -> Callable[[], Callable]:
+        CASES[name] = (setup, items, 'us')
+        return setup
+    return wrapper
+
+
+@case('parse')
+def _parse():
+    return lambda: [parse(line) for line in CORPUS]
+
+
+@case('parse_cached')
+def _parse_cached():
+    for line in CORPUS:
+        Markers(line)
+    return lambda: [Markers(line) for line in CORPUS]
+
+
+@case('str')
+def _str():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [str(marker) for marker in markers]
+
+
+@case('merge_loop', items=1000)
+def _merge_loop():
+    markers = [Markers(CORPUS[index % len(CORPUS)]) for index in range(1000)]
+
+    def run():
+        result = Markers()
+        for marker in markers:
+            result |= marker
+    return run
+
+
+@case('union_all', items=1000)
+def _union_all():
+    markers = [Markers(CORPUS[index % len(CORPUS)]) for index in range(1000)]
+    return lambda: Markers.union_all(markers)
+
+
+@case('and')
+def _and():
+    markers = [Markers(line) for line in CORPUS]
+    other = Markers('os_name == "nt"')
+    return lambda: [marker & other for marker in markers]
+
+
+@case('get_version')
+def _get_version():
+    # fresh trees, so lazy indexes are built every time
+    data = [Markers(line).to_bytes() for line in CORPUS]
+    markers = [Markers.from_bytes(item) for item in data]
+    return lambda: [marker.get_version('python_version') for marker in markers]
+
+
+@case('compat')
+def _compat():
+    markers = [Markers(line) for line in CORPUS]
+
+    def run():
+        for marker in markers:
+            try:
+                marker.compat
+            except Exception:
+                pass
+    return run
+
+
+@case('variables')
+def _variables():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [marker.variables for marker in markers]
+
+
+@case('evaluate')
+def _evaluate():
+    markers = [Markers(line) for line in CORPUS]
+    for marker in markers:
+        marker.compile()
+    environment = dict(ENVIRONMENTS[1])
+    return lambda: [marker.evaluate(environment) for marker in markers]
+
+
+@case('evaluate_many')
+def _evaluate_many():
+    markers = [Markers(line) for line in CORPUS]
+    environments = Environments(ENVIRONMENTS * 10)
+    return lambda: [marker.evaluate_many(environments) for marker in markers]
+
+
+@case('simplify')
+def _simplify():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [marker.simplify() for marker in markers]
+
+
+@case('is_satisfiable')
+def _is_satisfiable():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [marker.is_satisfiable() for marker in markers]
+
+
+@case('to_bytes')
+def _to_bytes():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [marker.to_bytes() for marker in markers]
+
+
+@case('from_bytes')
+def _from_bytes():
+    data = [Markers(line).to_bytes() for line in CORPUS]
+    return lambda: [Markers.from_bytes(item) for item in data]
+
+
+@case('copy')
+def _copy():
+    markers = [Markers(line) for line in CORPUS]
+    return lambda: [copy(marker) for marker in markers]
+
+
+def measure_time(setup: Callable[[], Callable], items: int, repeat: int, number: int) -> float:
+    """Get the best time of one item handling in microseconds.
+    """
+    func = setup()
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number / items * 10 ** 6
+
+
+def run(names: List[str], repeat: int, number: int, extra: bool = True) -> Dict[str, dict]:
+    """Run the given time cases, and memory and import time cases if `extra` is True.
+    """
+    results = dict()
+    for name in names:
+        setup, items, unit = CASES[name]
+        value = measure_time(setup, items=items, repeat=repeat, number=number)
+        results[name] = dict(value=value, unit=unit)
+        print('{:16} {:10.2f} {}'.format(name, value, unit))
+
+    if extra:
+        value = memory.measure(copies=20) / (20 * len(memory.CORPUS))
+        results['memory_per_tree'] = dict(value=value, unit='B')
+        print('{:16} {:10.2f} B'.format('memory_per_tree', value))
+        value = min(times['dephell_markers'] for times in (importtime.measure() for _ in range(repeat))) / 1000
+        results['import_time'] = dict(value=value, unit='ms')
+        print('{:16} {:10.2f} ms'.format('import_time', value))
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print difference with the baseline, return names of regressed cases.
+    """
+    regressions = []
+    print('\n{:16} {:>10} {:>10} {:>8}'.format('case', 'baseline', 'current', 'ratio'))
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or not old['value']:
+            continue
+        ratio = result['value'] / old['value']
+        mark = ''
+        if ratio > 1 + threshold:
+            mark = '  slower'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            mark = '  faster'
+        print('{:16} {:10.2f} {:10.2f} {:7.2f}x{}'.format(name, old['value'], result['value'], ratio, mark))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('cases', nargs='*', help='cases to run, all by default: memory, ' + ', '.join(CASES))
+    parser.add_argument('--output', help='save results to JSON file')
+    parser.add_argument('--compare', help='compare results with JSON file from the previous run')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown, 0.1 is 10%%')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.cases) - set(CASES) - {'memory'}
+    if unknown:
+        parser.error('unknown cases: ' + ', '.join(sorted(unknown)))
+    if args.cases:
+        names = [name for name in args.cases if name in CASES]
+    else:
+        names = list(CASES)
+    extra = not args.cases or 'memory' in args.cases
+
+    results = run(names, repeat=args.repeat, number=args.number, extra=extra)
+    if args.output:
+        data = dict(
+            meta=dict(
+                version=dephell_markers.__version__,
+                python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                platform=platform.platform(),
+                corpus=len(CORPUS),
+            ),
+            results=results,
+        )
+        Path(args.output).write_text(json.dumps(data, indent=2, sort_keys=True))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+        regressions = compare(results, baseline, threshold=args.threshold)
+        if regressions:
+            print('\nregressions: ' + ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Compare loading markers from `Markers.to_bytes` with parsing strings.
+
+Run from the repository root:
+
+    python -m benchmarks.serialize
+"""
+# built-in
+import pickle
+import timeit
+from pathlib import Path
+
+# project
+from dephell_markers import Markers
+
+
+CORPUS = [line for line in (Path(__file__).parent / 'corpus.txt').read_text().splitlines() if line]
+
+
+def run(func, items, number: int = 20) -> float:
+    timer = timeit.Timer(lambda: [func(item) for item in items])
+    return min(timer.repeat(repeat=5, number=number)) / number / len(items)
+
+
+def main():
+    # the parse cache would hide the parsing time
+    Markers.cache.resize(0)
+    markers = [Markers(line) for line in CORPUS]
+    dumped = [marker.to_bytes() for marker in markers]
+    pickled = [pickle.dumps(marker) for marker in markers]
+    print('size:        str {:6} B, bytes {:6} B, pickle {:6} B'.format(
+        sum(map(len, CORPUS)), sum(map(len, dumped)), sum(map(len, pickled)),
+    ))
+    print('parse:       {:8.2f} us/marker'.format(run(Markers, CORPUS) * 10 ** 6))
+    print('from_bytes:  {:8.2f} us/marker'.format(run(Markers.from_bytes, dumped) * 10 ** 6))
+    print('to_bytes:    {:8.2f} us/marker'.format(run(Markers.to_bytes, markers) * 10 ** 6))
+    print('unpickle:    {:8.2f} us/marker'.format(run(pickle.loads, pickled) * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Measure `Markers.variables` on deeply nested trees.
+
+Run from the repository root:
+
+    python -m benchmarks.variables
+"""
+# built-in
+import sys
+import timeit
+
+# project
+from dephell_markers import AndMarker, Markers, OrMarker, StringMarker, VersionMarker
+
+
+def make_tree(depth: int):
+    node = VersionMarker.from_parts(variable='python_version', operator='>=', value='3.6')
+    for level in range(depth):
+        leaf = StringMarker.from_parts(variable='extra', operator='==', value='e{}'.format(level))
+        container = AndMarker if level % 2 else OrMarker
+        node = container(leaf, node)
+    return node
+
+
+def main():
+    sys.setrecursionlimit(10000)
+    for depth in (10, 100, 1000):
+        trees = [make_tree(depth) for _ in range(20)]
+        markers = []
+        for tree in trees:
+            marker = Markers()
+            marker._marker = tree
+            markers.append(marker)
+        cold = timeit.timeit(lambda: [m.variables for m in markers], number=1) / len(markers)
+        warm = timeit.timeit(lambda: [m.variables for m in markers], number=100) / 100 / len(markers)
+        print('depth {:5}:  first {:9.2f} us, cached {:6.2f} us'.format(depth, cold * 10 ** 6, warm * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,63 @@
+# built-in
+import sys
+from importlib import import_module
+
 # app
+from ._bdd import BDD
+from ._bulk import parse_many
+from ._cache import CacheInfo, ParseCache
+from ._environments import Environments
+from ._instrument import Instrumentation, Metrics
+from ._intern import InternTable
 from ._marker import StringMarker, VersionMarker
 from ._markers import Markers
+from ._matrix import evaluate_matrix
 from ._operation import AndMarker, OrMarker
+from ._partition import Partition
+from ._readers import read_metadata, read_pipfile_lock, read_poetry_lock, read_wheel
+
+
+__version__ = '1.0.3'
+
+
+# names that are imported only on the first access because of heavy dependencies
+_LAZY = {
+    'DiskCache': '._disk_cache',    # sqlite3
+}
+
+if sys.version_info < (3, 7):
+    # module-level `__getattr__` isn't supported
+    from ._disk_cache import DiskCache  # noqa: F401
+else:
+    def __getattr__(name: str):
+        module = _LAZY.get(name)
+        if module is None:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value
+        return value
 
 
 # keep sorted
 __all__ = [
     'AndMarker',
+    'BDD',
+    'CacheInfo',
+    'DiskCache',
+    'Environments',
+    'Instrumentation',
+    'InternTable',
     'Markers',
+    'Metrics',
     'OrMarker',
+    'ParseCache',
+    'Partition',
     'StringMarker',
     'VersionMarker',
+    'evaluate_matrix',
+    'parse_many',
+    'read_metadata',
+    'read_pipfile_lock',
+    'read_poetry_lock',
+    'read_wheel',
 ]
@@ -0,0 +1,422 @@
+# built-in
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+# app
+from ._domain import StringDomain, VersionDomain, get_domain
+from ._marker import BaseMarker, StringMarker, VersionMarker
+from ._markers import Markers
+from ._operation import AndMarker, Operation, OrMarker
+from ._simplify import NEVER
+
+
+if TYPE_CHECKING:
+    # external
+    from packaging.version import Version
+
+
+Tree = Union[Operation, BaseMarker]
+# version and is it included in the left segment
+Cut = Tuple['Version', bool]
+
+# kinds of nodes
+TERMINAL = 0
+VERSION = 1     # segments of versions split by cuts
+STRING = 2      # the given string values and all other values
+ATOM = 3        # single marker that isn't representable as a set of values
+
+NEGATED_OPERATORS = {
+    '==': '!=',
+    '!=': '==',
+    '<': '>=',
+    '>=': '<',
+    '>': '<=',
+    '<=': '>',
+    'in': 'not in',
+    'not in': 'in',
+}
+# atoms are kept only with positive operators, so `x` and `not x` are one atom
+NEGATIVE_OPERATORS = frozenset({'!=', '>=', '>', 'not in'})
+
+
+class BDDNode:
+    """Node of the decision diagram. Equivalent functions are the same node.
+
+    Every variable is checked in one node that splits all its values
+    into segments, so there are no paths with contradicting conditions
+    like `python_version < "3" and python_version >= "3.6"`.
+    """
+    __slots__ = ('bdd', 'kind', 'variable', 'cuts', 'children', 'atom', 'order', '__weakref__')
+
+    def __init__(self, bdd: 'BDD', kind: int, variable: str = '', cuts: tuple = (),
+                 children: tuple = (), atom: Optional[BaseMarker] = None):
+        self.bdd = bdd
+        self.kind = kind
+        self.variable = variable
+        # VERSION: sorted cuts. STRING: sorted values. TERMINAL: (result, ).
+        self.cuts = cuts
+        # VERSION: segment children. STRING: value children and the default. ATOM: false and true children.
+        self.children = children
+        self.atom = atom
+        if kind == TERMINAL:
+            self.order = (1, )  # type: tuple
+        elif kind == ATOM:
+            self.order = (0, variable, 1, str(atom))
+        else:
+            self.order = (0, variable, 0, '')
+
+    @property
+    def is_true(self) -> bool:
+        return self is self.bdd.true
+
+    @property
+    def is_false(self) -> bool:
+        return self is self.bdd.false
+
+    def to_markers(self) -> Markers:
+        return self.bdd.to_markers(self)
+
+    def __and__(self, other: 'BDDNode') -> 'BDDNode':
+        return self.bdd.apply('and', self, other)
+
+    def __or__(self, other: 'BDDNode') -> 'BDDNode':
+        return self.bdd.apply('or', self, other)
+
+    def __invert__(self) -> 'BDDNode':
+        return self.bdd.negate(self)
+
+    def __repr__(self) -> str:
+        if self.kind == TERMINAL:
+            return '{}({})'.format(type(self).__name__, self.cuts[0])
+        return '{}({!r})'.format(type(self).__name__, str(self.to_markers()))
+
+
+class BDD:
+    """Reduced ordered decision diagrams for markers.
+
+    All nodes are kept in the unique table, so equivalent markers
+    converted by the same instance are the same node, and equivalence
+    is an identity check. Results of operations are cached.
+
+    Single markers that can't be represented as a set of values
+    (`in`, comparison of two variables, invalid versions) are independent
+    boolean atoms, so equivalence for them is only structural.
+    The instance isn't thread-safe.
+    """
+
+    def __init__(self):
+        self._unique = dict()       # type: Dict[tuple, BDDNode]
+        self._cache = dict()        # type: Dict[tuple, BDDNode]
+        self._converted = dict()    # type: Dict[Tree, BDDNode]
+        self.true = BDDNode(self, kind=TERMINAL, cuts=(True, ))
+        self.false = BDDNode(self, kind=TERMINAL, cuts=(False, ))
+
+    # conversion
+
+    def from_markers(self, markers: Union[Markers, Tree, str, None]) -> BDDNode:
+        if isinstance(markers, str):
+            markers = Markers(markers)
+        if isinstance(markers, Markers):
+            markers = markers._marker
+        if markers is None:
+            return self.true
+        return self._from_tree(markers)
+
+    def _from_tree(self, tree: Tree) -> BDDNode:
+        node = self._converted.get(tree)
+        if node is not None:
+            return node
+        if isinstance(tree, BaseMarker):
+            node = self._from_leaf(tree)
+        else:
+            op = 'and' if isinstance(tree, AndMarker) else 'or'
+            node = self.true if op == 'and' else self.false
+            # cheap nodes go first, so intermediate results are smaller
+            for child in sorted(tree.nodes, key=lambda child: child.size):
+                node = self.apply(op, node, self._from_tree(child))
+        self._converted[tree] = node
+        return node
+
+    def _from_leaf(self, leaf: BaseMarker) -> BDDNode:
+        domain = get_domain(leaf)
+        if isinstance(domain, VersionDomain):
+            if not domain.intervals:
+                return self.false
+            cuts = []   # type: List[Cut]
+            for low, low_included, high, high_included in domain.intervals:
+                if low is not None:
+                    cuts.append((low, not low_included))
+                if high is not None:
+                    cuts.append((high, high_included))
+            # intervals are disjoint, so segments alternate
+            children = []
+            inside = domain.intervals[0][0] is None
+            for _ in range(len(cuts) + 1):
+                children.append(self.true if inside else self.false)
+                inside = not inside
+            return self._make_version(leaf.variable, tuple(cuts), tuple(children))
+
+        if isinstance(domain, StringDomain):
+            values = tuple(sorted(domain.values))
+            inside = self.false if domain.negated else self.true
+            outside = self.true if domain.negated else self.false
+            return self._make_string(leaf.variable, values, (inside, ) * len(values) + (outside, ))
+
+        if leaf.operator in NEGATIVE_OPERATORS:
+            return self._make_atom(_negate(leaf), self.true, self.false)
+        return self._make_atom(leaf, self.false, self.true)
+
+    def to_markers(self, node: BDDNode) -> Markers:
+        """Convert the node into markers.
+
+        Raises ValueError if the node has negation of a single marker
+        that can't be written as a marker, like `===`.
+        """
+        tree = self._to_tree(node, dict())
+        if tree is True:
+            return Markers()
+        if tree is False:
+            return Markers(NEVER)
+        markers = Markers()
+        markers._marker = tree
+        return markers
+
+    def _to_tree(self, node: BDDNode, memo: Dict[BDDNode, Union[Tree, bool]]) -> Union[Tree, bool]:
+        if node.kind == TERMINAL:
+            return node.cuts[0]
+        tree = memo.get(node)
+        if tree is not None:
+            return tree
+
+        branches = []   # type: List[Tuple[Union[Tree, bool], Union[Tree, bool]]]
+        if node.kind == VERSION:
+            bounds = (None, ) + node.cuts + (None, )
+            for index, child in enumerate(node.children):
+                if not child.is_false:
+                    condition = _segment(node.variable, bounds[index], bounds[index + 1])
+                    branches.append((condition, self._to_tree(child, memo)))
+        elif node.kind == STRING:
+            default = node.children[-1]
+            # values with the same child are joined into one branch
+            groups = dict()     # type: Dict[BDDNode, List[str]]
+            for value, child in zip(node.cuts, node.children):
+                groups.setdefault(child, []).append(value)
+            for child, values in groups.items():
+                if not child.is_false:
+                    condition = _or([_string(node.variable, '==', value) for value in values])
+                    branches.append((condition, self._to_tree(child, memo)))
+            if not default.is_false:
+                condition = _and([_string(node.variable, '!=', value) for value in node.cuts])
+                branches.append((condition, self._to_tree(default, memo)))
+        else:
+            low, high = node.children
+            atom = _get_atom(node)
+            if not high.is_false:
+                branches.append((atom, self._to_tree(high, memo)))
+            if high.is_true:
+                # `atom or low` is the same as `atom or (not atom and low)`
+                branches.append((True, self._to_tree(low, memo)))
+            elif not low.is_false:
+                branches.append((_negate(atom), self._to_tree(low, memo)))
+
+        tree = _or([_and([condition, child]) for condition, child in branches])
+        memo[node] = tree
+        return tree
+
+    # operations
+
+    def apply(self, op: str, left: BDDNode, right: BDDNode) -> BDDNode:
+        """Get `left and right` or `left or right` node.
+        """
+        is_and = op == 'and'
+        if left is right:
+            return left
+        for first, second in ((left, right), (right, left)):
+            if first.kind == TERMINAL:
+                if first.cuts[0] is is_and:
+                    # `True and x` or `False or x`
+                    return second
+                # `False and x` or `True or x`
+                return first
+
+        key = (op, left, right)
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        if left.order < right.order:
+            result = self._map(left, lambda child: self.apply(op, child, right))
+        elif right.order < left.order:
+            result = self._map(right, lambda child: self.apply(op, left, child))
+        elif left.kind == VERSION:
+            cuts = tuple(sorted(set(left.cuts) | set(right.cuts)))
+            children = []
+            for index in range(len(cuts) + 1):
+                # index of the segment in every node, the segment starts after the previous cut
+                left_index = bisect_right(left.cuts, cuts[index - 1]) if index else 0
+                right_index = bisect_right(right.cuts, cuts[index - 1]) if index else 0
+                children.append(self.apply(op, left.children[left_index], right.children[right_index]))
+            result = self._make_version(left.variable, cuts, tuple(children))
+        elif left.kind == STRING:
+            left_children = dict(zip(left.cuts, left.children))
+            right_children = dict(zip(right.cuts, right.children))
+            values = tuple(sorted(set(left.cuts) | set(right.cuts)))
+            children = [
+                self.apply(
+                    op,
+                    left_children.get(value, left.children[-1]),
+                    right_children.get(value, right.children[-1]),
+                ) for value in values
+            ]
+            children.append(self.apply(op, left.children[-1], right.children[-1]))
+            result = self._make_string(left.variable, values, tuple(children))
+        else:
+            result = self._make_atom(
+                _get_atom(left),
+                self.apply(op, left.children[0], right.children[0]),
+                self.apply(op, left.children[1], right.children[1]),
+            )
+
+        self._cache[key] = result
+        return result
+
+    def negate(self, node: BDDNode) -> BDDNode:
+        if node.is_true:
+            return self.false
+        if node.is_false:
+            return self.true
+        key = ('not', node)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._map(node, self.negate)
+            self._cache[key] = result
+        return result
+
+    def equivalent(self, left: Union[Markers, Tree, str, None], right: Union[Markers, Tree, str, None]) -> bool:
+        """Check if markers match the same environments.
+
+        Versions are compared as ranges, so, like `Markers.simplify`, it ignores
+        PEP-440 rules for pre-releases: `python_version < "3.13" or python_version >= "3.13"`
+        is equivalent to empty markers, but doesn't match `3.13.0rc1`.
+        """
+        return self.from_markers(left) is self.from_markers(right)
+
+    def clear(self) -> None:
+        """Drop all nodes and caches. Nodes made before it must not be used after.
+        """
+        self._unique.clear()
+        self._cache.clear()
+        self._converted.clear()
+
+    def __len__(self) -> int:
+        return len(self._unique)
+
+    def __repr__(self) -> str:
+        return '{}(nodes={}, cache={})'.format(type(self).__name__, len(self._unique), len(self._cache))
+
+    # private methods
+
+    def _map(self, node: BDDNode, func) -> BDDNode:
+        """Make node with the given function applied to all children.
+        """
+        children = tuple(func(child) for child in node.children)
+        if node.kind == VERSION:
+            return self._make_version(node.variable, node.cuts, children)
+        if node.kind == STRING:
+            return self._make_string(node.variable, node.cuts, children)
+        return self._make_atom(_get_atom(node), *children)
+
+    def _make_version(self, variable: str, cuts: Tuple[Cut, ...], children: Tuple[BDDNode, ...]) -> BDDNode:
+        # merge neighbor segments with the same child
+        new_cuts = []
+        new_children = [children[0]]
+        for cut, child in zip(cuts, children[1:]):
+            if child is not new_children[-1]:
+                new_cuts.append(cut)
+                new_children.append(child)
+        if not new_cuts:
+            return new_children[0]
+        return self._make(VERSION, variable, tuple(new_cuts), tuple(new_children))
+
+    def _make_string(self, variable: str, values: Tuple[str, ...], children: Tuple[BDDNode, ...]) -> BDDNode:
+        # values with the same child as all other values are redundant
+        default = children[-1]
+        pairs = [(value, child) for value, child in zip(values, children) if child is not default]
+        if not pairs:
+            return default
+        return self._make(
+            STRING, variable,
+            tuple(value for value, _ in pairs),
+            tuple(child for _, child in pairs) + (default, ),
+        )
+
+    def _make_atom(self, atom: BaseMarker, low: BDDNode, high: BDDNode) -> BDDNode:
+        if low is high:
+            return low
+        return self._make(ATOM, atom.variable, (), (low, high), atom=atom)
+
+    def _make(self, kind: int, variable: str, cuts: tuple, children: tuple,
+              atom: Optional[BaseMarker] = None) -> BDDNode:
+        key = (kind, variable, cuts, children, atom)
+        node = self._unique.get(key)
+        if node is None:
+            node = BDDNode(self, kind=kind, variable=variable, cuts=cuts, children=children, atom=atom)
+            self._unique[key] = node
+        return node
+
+
+def _segment(variable: str, low: Optional[Cut], high: Optional[Cut]) -> Union[Tree, bool]:
+    """Make marker for versions between two cuts.
+    """
+    if low is not None and high is not None and low[0] == high[0]:
+        # the only version between `< v | >= v` and `<= v | > v` cuts
+        return _version(variable, '==', low[0])
+    nodes = []  # type: List[Union[Tree, bool]]
+    if low is not None:
+        nodes.append(_version(variable, '>' if low[1] else '>=', low[0]))
+    if high is not None:
+        nodes.append(_version(variable, '<=' if high[1] else '<', high[0]))
+    return _and(nodes)
+
+
+def _version(variable: str, operator: str, version: 'Version') -> BaseMarker:
+    return VersionMarker.from_parts(variable, operator, str(version))
+
+
+def _string(variable: str, operator: str, value: str) -> BaseMarker:
+    return StringMarker.from_parts(variable, operator, value)
+
+
+def _get_atom(node: BDDNode) -> BaseMarker:
+    if node.atom is None:
+        raise TypeError('node has no atom: {!r}'.format(node))
+    return node.atom
+
+
+def _negate(atom: BaseMarker) -> BaseMarker:
+    operator = NEGATED_OPERATORS.get(atom.operator)
+    if operator is None:
+        raise ValueError('cannot negate marker: {}'.format(atom))
+    return atom.from_parts(atom.variable, operator, atom.value, atom.layout)
+
+
+def _and(nodes: List[Union[Tree, bool]]) -> Union[Tree, bool]:
+    if any(node is False for node in nodes):
+        return False
+    nodes = [node for node in nodes if node is not True]
+    if not nodes:
+        return True
+    if len(nodes) == 1:
+        return nodes[0]
+    return AndMarker(*nodes)
+
+
+def _or(nodes: List[Union[Tree, bool]]) -> Union[Tree, bool]:
+    if any(node is True for node in nodes):
+        return True
+    nodes = [node for node in nodes if node is not False]
+    if not nodes:
+        return False
+    if len(nodes) == 1:
+        return nodes[0]
+    return OrMarker(*nodes)
@@ -0,0 +1,110 @@
+# built-in
+import os
+from copy import copy
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# app
+from ._markers import Markers
+from ._parser import parse
+from ._serialize import dumps, loads
+
+
+# parsed tree in binary form or exception raised by parser
+Result = Tuple[bool, Union[bytes, Exception]]
+
+
+def parse_many(strings: Iterable[str], workers: Optional[int] = None,
+               chunksize: int = 256) -> List[Union[Markers, Exception]]:
+    """Parse a lot of markers strings in a pool of processes.
+
+    Equal strings are parsed only once. Results are in the same order as the given strings:
+    `Markers` for every valid string and the exception instance for every invalid one.
+    Markers for equal strings share the same tree.
+    Trees are put into `Markers.cache`, so `Markers(string)` doesn't parse them again.
+
+    `workers` is the number of processes, all CPUs by default.
+    If it's 1 or there is not enough work for two chunks, strings are parsed in the current process.
+    """
+    cache = Markers.cache
+    keys = [cache.normalize(string) for string in strings]
+
+    trees = dict()      # type: Dict[str, object]
+    missed = []         # type: List[str]
+    for key in keys:
+        if key in trees or not key:
+            continue
+        tree = cache.get(key)
+        trees[key] = tree
+        if tree is None:
+            missed.append(key)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(missed) > chunksize:
+        parsed = _parse_in_pool(missed, workers=workers, chunksize=chunksize)
+    else:
+        parsed = _parse_here(missed)
+    for key, tree in parsed.items():
+        if not isinstance(tree, Exception):
+            cache.set(key, tree)
+    trees.update(parsed)
+
+    markers = dict()    # type: Dict[str, Union[Markers, Exception]]
+    output = []         # type: List[Union[Markers, Exception]]
+    for key in keys:
+        if not key:
+            output.append(Markers())
+            continue
+        marker = markers.get(key)
+        if marker is None:
+            tree = trees[key]
+            if isinstance(tree, Exception):
+                marker = tree
+            else:
+                marker = Markers()
+                marker._marker = tree  # type: ignore
+            markers[key] = marker
+            output.append(marker)
+        elif isinstance(marker, Exception):
+            output.append(marker)
+        else:
+            # every input gets its own handle for the same tree
+            output.append(copy(marker))
+    return output
+
+
+def _parse_here(strings: List[str]) -> Dict[str, object]:
+    trees = dict()  # type: Dict[str, object]
+    for string in strings:
+        try:
+            trees[string] = parse(string)
+        except Exception as exc:
+            trees[string] = exc
+    return trees
+
+
+def _parse_in_pool(strings: List[str], workers: int, chunksize: int) -> Dict[str, object]:
+    # lazy import, `multiprocessing` is heavy
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [strings[index:index + chunksize] for index in range(0, len(strings), chunksize)]
+    trees = dict()  # type: Dict[str, object]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for chunk, results in zip(chunks, pool.map(_parse_chunk, chunks)):
+            for string, (ok, value) in zip(chunk, results):
+                trees[string] = loads(value) if ok else value    # type: ignore
+    return trees
+
+
+def _parse_chunk(strings: List[str]) -> List[Result]:
+    """Parse strings in a worker process, trees are sent back in binary form.
+    """
+    results = []    # type: List[Result]
+    for string in strings:
+        try:
+            tree = parse(string)
+        except Exception as exc:
+            results.append((False, exc))
+        else:
+            results.append((True, dumps(tree)))
+    return results
@@ -0,0 +1,90 @@
+# built-in
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ParseCache:
+    """
+    Bounded thread-safe LRU cache for parsed markers trees.
+
+    Trees returned from the cache are shared between all `Markers` instances
+    built from the same string, so they must never be mutated in place.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._data = OrderedDict()  # type: OrderedDict
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(key: str) -> str:
+        return key.strip()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: str):
+        """Get tree for the given normalized string or None if it isn't cached.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._shrink()
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._shrink()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                maxsize=self._maxsize,
+                currsize=len(self._data),
+            )
+
+    def _shrink(self) -> None:
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={}'.format(name, value) for name, value in self.info()._asdict().items()
+        ))
@@ -1,11 +1,14 @@
-
-
 # https://github.com/bottlepy/bottle/commit/fa7733e075da0d790d809aa3d2f53071897e6f76
 # https://github.com/pydanny/cached-property/blob/master/cached_property.py
 class cached_property(object):  # noqa: N801
     """
     A property that is only computed once per instance and then replaces itself
     with an ordinary attribute. Deleting the attribute resets the property.
+
+    It's thread-safe without locks: concurrent threads can compute the value
+    at the same time, but only the first stored value is kept and returned to all
+    of them. `dict.setdefault` is atomic, including free-threaded CPython builds.
+    So the function must be pure, and its result must not depend on what thread wins.
     """  # noqa
 
     def __init__(self, func):
@@ -15,5 +18,5 @@ class cached_property(object):  # noqa: N801
     def __get__(self, obj, cls):
         if obj is None:
             return self
-        value = obj.__dict__[self.func.__name__] = self.func(obj)
-        return value
+        value = self.func(obj)
+        return obj.__dict__.setdefault(self.func.__name__, value)
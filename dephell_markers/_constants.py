@@ -13,6 +13,37 @@ REVERSED_OPERATIONS = MappingProxyType({
 })
 
 
+# operations that don't depend on the order of operands
+SYMMETRIC_OPERATIONS = frozenset({'==', '===', '!='})
+
+
+# result of `and` for two operations with the same version, None if nothing matches
+MERGED_OPERATIONS = MappingProxyType({
+    # different
+    frozenset({'>', '<'}):      None,
+    frozenset({'>=', '<'}):     None,
+    frozenset({'>', '<='}):     None,
+    frozenset({'>=', '<='}):    '==',
+
+    # equal
+    frozenset({'>', '=='}):     None,
+    frozenset({'<', '=='}):     None,
+    frozenset({'==', '=='}):    '==',
+    frozenset({'>=', '=='}):    '==',
+    frozenset({'<=', '=='}):    '==',
+
+    # greater than
+    frozenset({'>=', '>='}):    '>=',
+    frozenset({'>=', '>'}):     '>',
+    frozenset({'>', '>'}):      '>',
+
+    # less than
+    frozenset({'<=', '<='}):    '<=',
+    frozenset({'<=', '<'}):     '<',
+    frozenset({'<', '<'}):      '<',
+})
+
+
 VARIABLES = dict(
     python_name={
         'implementation_name',              # 'cpython'
@@ -0,0 +1,143 @@
+# built-in
+import os
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Union
+
+
+def get_cache_dir() -> Path:
+    """Get user cache directory: `XDG_CACHE_HOME`, `LOCALAPPDATA` on Windows, or `~/.cache`.
+    """
+    path = os.environ.get('XDG_CACHE_HOME')
+    if not path and os.name == 'nt':
+        path = os.environ.get('LOCALAPPDATA')
+    if not path:
+        return Path.home() / '.cache' / 'dephell_markers'
+    return Path(path) / 'dephell_markers'
+
+
+class DiskCache:
+    """
+    Persistent cache of parsed markers trees shared between processes.
+
+    Trees are stored in a sqlite database as `Markers.to_bytes` blobs keyed
+    by the marker string and the package version. Every write is a transaction,
+    and WAL journal lets concurrent processes read while one of them writes.
+    When the cache grows over `maxsize` entries, the oldest ones are evicted.
+    Any database error disables the cache for the rest of the process
+    instead of breaking parsing.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, maxsize: int = 65536, timeout: float = 5.0):
+        # lazy import to avoid cycle
+        from . import __version__
+
+        if path is None:
+            path = get_cache_dir() / 'parse.sqlite3'
+        self.path = Path(path)
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.version = __version__
+        self.broken = False
+        self._lock = Lock()
+        self._connection = None     # type: Optional[sqlite3.Connection]
+        self._pid = None            # type: Optional[int]
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get serialized tree for the given normalized string or None if it isn't cached.
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                row = connection.execute(
+                    'SELECT data FROM markers WHERE version = ? AND key = ?',
+                    (self.version, key),
+                ).fetchone()
+            except sqlite3.Error:
+                self._break()
+                return None
+        if row is None:
+            return None
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO markers (version, key, data) VALUES (?, ?, ?)',
+                        (self.version, key, value),
+                    )
+                self._writes += 1
+                # counting rows isn't free, so check the size only from time to time
+                if self._writes % 256 == 1:
+                    self._shrink(connection)
+            except sqlite3.Error:
+                self._break()
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.execute('DELETE FROM markers')
+            except sqlite3.Error:
+                self._break()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.broken:
+            return None
+        # connection can't be shared with forked processes
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=self.timeout, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS markers ('
+                    'version TEXT NOT NULL, key TEXT NOT NULL, data BLOB NOT NULL, '
+                    'PRIMARY KEY (version, key))'
+                )
+        except (OSError, sqlite3.Error):
+            self._break()
+            return None
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _shrink(self, connection: sqlite3.Connection) -> None:
+        count = connection.execute('SELECT COUNT(*) FROM markers').fetchone()[0]
+        if count <= self.maxsize:
+            return
+        # evict the oldest entries and some more to not do it on every write
+        excess = count - self.maxsize + self.maxsize // 10
+        with connection:
+            connection.execute(
+                'DELETE FROM markers WHERE rowid IN (SELECT rowid FROM markers ORDER BY rowid LIMIT ?)',
+                (excess, ),
+            )
+
+    def _break(self) -> None:
+        self.broken = True
+        self._connection = None
+
+    def __repr__(self) -> str:
+        return '{}(path={!r}, maxsize={})'.format(type(self).__name__, str(self.path), self.maxsize)
@@ -0,0 +1,258 @@
+# built-in
+from typing import TYPE_CHECKING, FrozenSet, List, Optional, Tuple, Union
+
+# app
+from ._marker import BaseMarker, StringMarker, VersionMarker
+from ._marker._base import VARIABLE_VARIABLE
+
+
+if TYPE_CHECKING:
+    # external
+    from packaging.version import Version
+
+
+# low, is low included, high, is high included. None bound is infinity.
+Interval = Tuple[Optional['Version'], bool, Optional['Version'], bool]
+
+
+class VersionDomain:
+    """Set of versions as sorted list of disjoint intervals.
+
+    PEP-440 special cases for pre-, post- and local versions in comparison
+    operators are ignored, so the domain is exact only for final releases.
+    """
+    __slots__ = ('intervals', )
+
+    def __init__(self, intervals: List[Interval]):
+        self.intervals = intervals
+
+    @classmethod
+    def from_operator(cls, op: str, version: 'Version') -> Optional['VersionDomain']:
+        if op == '==':
+            return cls([(version, True, version, True)])
+        if op == '!=':
+            return cls([(None, False, version, False), (version, False, None, False)])
+        if op == '<':
+            return cls([(None, False, version, False)])
+        if op == '<=':
+            return cls([(None, False, version, True)])
+        if op == '>':
+            return cls([(version, False, None, False)])
+        if op == '>=':
+            return cls([(version, True, None, False)])
+        if op == '~=' and len(version.release) > 1:
+            # `~=2.2.1` is `>=2.2.1,<2.3`
+            release = list(version.release[:-1])
+            release[-1] += 1
+            upper = type(version)('{}!{}'.format(version.epoch, '.'.join(map(str, release))))
+            return cls([(version, True, upper, False)])
+        return None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.intervals
+
+    @property
+    def is_full(self) -> bool:
+        return self.intervals == [(None, False, None, False)]
+
+    def intersect(self, other: 'VersionDomain') -> 'VersionDomain':
+        intervals = []
+        for left in self.intervals:
+            for right in other.intervals:
+                interval = _intersect_intervals(left, right)
+                if interval is not None:
+                    intervals.append(interval)
+        return type(self)(_normalize(intervals))
+
+    def union(self, other: 'VersionDomain') -> 'VersionDomain':
+        return type(self)(_normalize(self.intervals + other.intervals))
+
+    def complement(self) -> 'VersionDomain':
+        intervals = []  # type: List[Interval]
+        low = None  # type: Optional[Version]
+        low_included = False
+        for interval in self.intervals:
+            if interval[0] is not None:
+                intervals.append((low, low_included, interval[0], not interval[1]))
+            low, low_included = interval[2], not interval[3]
+            if low is None:
+                break
+        else:
+            intervals.append((low, low_included, None, False))
+        return type(self)(intervals)
+
+    def issubset(self, other: 'VersionDomain') -> bool:
+        return self.intersect(other.complement()).is_empty
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionDomain):
+            return NotImplemented
+        return self.intervals == other.intervals
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(type(self).__name__, self.intervals)
+
+
+class StringDomain:
+    """Set of strings: the given values or everything except them.
+    """
+    __slots__ = ('values', 'negated')
+
+    def __init__(self, values: FrozenSet[str], negated: bool = False):
+        self.values = values
+        self.negated = negated
+
+    @classmethod
+    def from_operator(cls, op: str, value: str) -> Optional['StringDomain']:
+        if op == '==':
+            return cls(frozenset({value}))
+        if op == '!=':
+            return cls(frozenset({value}), negated=True)
+        return None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.negated and not self.values
+
+    @property
+    def is_full(self) -> bool:
+        return self.negated and not self.values
+
+    def intersect(self, other: 'StringDomain') -> 'StringDomain':
+        if self.negated and other.negated:
+            return type(self)(self.values | other.values, negated=True)
+        if self.negated:
+            return type(self)(other.values - self.values)
+        if other.negated:
+            return type(self)(self.values - other.values)
+        return type(self)(self.values & other.values)
+
+    def union(self, other: 'StringDomain') -> 'StringDomain':
+        if self.negated and other.negated:
+            return type(self)(self.values & other.values, negated=True)
+        if self.negated:
+            return type(self)(self.values - other.values, negated=True)
+        if other.negated:
+            return type(self)(other.values - self.values, negated=True)
+        return type(self)(self.values | other.values)
+
+    def complement(self) -> 'StringDomain':
+        return type(self)(self.values, negated=not self.negated)
+
+    def issubset(self, other: 'StringDomain') -> bool:
+        return self.intersect(other.complement()).is_empty
+
+    def __eq__(self, other):
+        if not isinstance(other, StringDomain):
+            return NotImplemented
+        return self.values == other.values and self.negated == other.negated
+
+    def __repr__(self) -> str:
+        return '{}({!r}, negated={!r})'.format(type(self).__name__, set(self.values), self.negated)
+
+
+Domain = Union[VersionDomain, StringDomain]
+
+
+def get_domain(marker: BaseMarker) -> Optional[Domain]:
+    """Get set of values of the marker variable that match the marker.
+
+    Returns None if the marker can't be represented as a domain:
+    unsupported operator, comparison of two variables, invalid version.
+    """
+    if marker.layout == VARIABLE_VARIABLE:
+        return None
+    if isinstance(marker, VersionMarker):
+        # external
+        from packaging.version import Version
+
+        version = marker.version
+        if not isinstance(version, Version):
+            return None
+        return VersionDomain.from_operator(op=marker.operator, version=version)
+    if isinstance(marker, StringMarker):
+        return StringDomain.from_operator(op=marker.operator, value=marker.value)
+    return None
+
+
+def _intersect_intervals(left: Interval, right: Interval) -> Optional[Interval]:
+    # the biggest low bound
+    if left[0] is None:
+        low, low_included = right[0], right[1]
+    elif right[0] is None or left[0] > right[0]:
+        low, low_included = left[0], left[1]
+    elif left[0] < right[0]:
+        low, low_included = right[0], right[1]
+    else:
+        low, low_included = left[0], left[1] and right[1]
+
+    # the smallest high bound
+    if left[2] is None:
+        high, high_included = right[2], right[3]
+    elif right[2] is None or left[2] < right[2]:
+        high, high_included = left[2], left[3]
+    elif left[2] > right[2]:
+        high, high_included = right[2], right[3]
+    else:
+        high, high_included = left[2], left[3] and right[3]
+
+    interval = (low, low_included, high, high_included)
+    if _is_empty(interval):
+        return None
+    return interval
+
+
+def _is_empty(interval: Interval) -> bool:
+    low, low_included, high, high_included = interval
+    if low is None or high is None:
+        return False
+    if low < high:
+        return False
+    if low == high:
+        return not (low_included and high_included)
+    return True
+
+
+def _normalize(intervals: List[Interval]) -> List[Interval]:
+    """Sort intervals and merge overlapping ones.
+    """
+    intervals = [interval for interval in intervals if not _is_empty(interval)]
+    intervals.sort(key=_low_key)
+    result = []  # type: List[Interval]
+    for interval in intervals:
+        if not result:
+            result.append(interval)
+            continue
+        low, low_included, high, high_included = result[-1]
+        if not _are_connected(result[-1], interval):
+            result.append(interval)
+            continue
+        # merge with the previous interval
+        if high is None:
+            continue
+        if interval[2] is None or interval[2] > high:
+            high, high_included = interval[2], interval[3]
+        elif interval[2] == high:
+            high_included = high_included or interval[3]
+        result[-1] = (low, low_included, high, high_included)
+    return result
+
+
+def _low_key(interval: Interval):
+    # None (infinity) goes first, included bound goes before excluded one
+    if interval[0] is None:
+        return (0, )
+    return (1, interval[0], not interval[1])
+
+
+def _are_connected(left: Interval, right: Interval) -> bool:
+    """Check if the right interval starts before the left one ends.
+    """
+    if left[2] is None or right[0] is None:
+        return True
+    if right[0] < left[2]:
+        return True
+    if right[0] == left[2]:
+        return left[3] or right[1]
+    return False
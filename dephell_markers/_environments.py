@@ -0,0 +1,79 @@
+# built-in
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# app
+from ._evaluate import Environment, get_environment, undefined_name
+
+
+Column = List[Tuple[str, int]]  # distinct value and bitmask of environments that have it
+
+
+class Environments:
+    """Collection of environments encoded column-wise.
+
+    Every column keeps only distinct values and for every value a bitmask
+    of environments that have this value. So every marker is checked only once
+    for every distinct value, and results are combined with bitwise operations.
+    """
+
+    def __init__(self, environments: Iterable[Optional[Environment]], fill: bool = True):
+        """
+        If `fill` is True then missed values are taken from the current environment.
+        """
+        columns = dict()  # type: Dict[str, Dict[str, int]]
+        size = 0
+        for index, environment in enumerate(environments):
+            bit = 1 << index
+            for name, value in (environment or {}).items():
+                column = columns.setdefault(name, dict())
+                column[value] = column.get(value, 0) | bit
+            size = index + 1
+        self.size = size
+        self.full = (1 << size) - 1
+
+        if fill and size:
+            # set default value for all environments that don't have the variable
+            for name, value in get_environment().items():
+                column = columns.setdefault(name, dict())
+                missed = self.full & ~sum(column.values())
+                if missed:
+                    column[value] = column.get(value, 0) | missed
+        self._columns = {name: list(column.items()) for name, column in columns.items()}
+        self._masks = dict()  # type: Dict[object, int]
+        # variables that some environments don't have
+        self._partial = {name for name, column in columns.items() if sum(column.values()) != self.full}
+
+    def column(self, name: str) -> Column:
+        if name not in self._columns or name in self._partial:
+            raise undefined_name(name)
+        return self._columns[name]
+
+    def leaf_mask(self, marker) -> int:
+        """Get bitmask of environments that match the given single marker.
+        """
+        key = marker._key
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+        column = self.column(marker.variable)
+        predicate = marker._predicate()
+        mask = 0
+        for value, value_mask in column:
+            if predicate(value):
+                mask |= value_mask
+        self._masks[key] = mask
+        return mask
+
+    def unpack(self, mask: int) -> List[bool]:
+        """Convert bitmask into list of booleans, one for every environment.
+        """
+        if not self.size:
+            return []
+        bits = bin(mask)[2:].zfill(self.size)
+        return [bit == '1' for bit in reversed(bits)]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return '{}(size={}, columns={})'.format(type(self).__name__, self.size, len(self._columns))
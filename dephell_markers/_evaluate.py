@@ -0,0 +1,107 @@
+# built-in
+import operator
+from typing import Callable, Dict, Optional
+
+# app
+from ._versions import VersionKey, get_version_key, parse_version
+
+
+Environment = Dict[str, str]
+Predicate = Callable[[str], bool]
+
+OPERATORS = {
+    'in': lambda lhs, rhs: lhs in rhs,
+    'not in': lambda lhs, rhs: lhs not in rhs,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '>': operator.gt,
+    '===': operator.eq,
+}
+
+# operators that can be checked by comparing versions
+# if the checked version is a final release
+COMPARISONS = {'<', '<=', '==', '!=', '>=', '>'}
+
+_default_environment = None  # type: Optional[Environment]
+
+
+def get_environment(environment: Optional[Environment] = None) -> Environment:
+    """Get the current environment updated by the given values.
+    """
+    global _default_environment
+    if _default_environment is None:
+        # external
+        from packaging.markers import default_environment
+
+        _default_environment = default_environment()
+        _default_environment['extra'] = ''
+    result = _default_environment.copy()
+    if environment:
+        result.update(environment)
+    return result
+
+
+def undefined_comparison(op: str, value: str) -> Exception:
+    # external
+    from packaging.markers import UndefinedComparison
+
+    return UndefinedComparison('Undefined {!r} on {!r}'.format(op, value))
+
+
+def undefined_name(name: str) -> Exception:
+    # external
+    from packaging.markers import UndefinedEnvironmentName
+
+    return UndefinedEnvironmentName('{0!r} does not exist in evaluation environment.'.format(name))
+
+
+def string_predicate(op: str, value: str, reverse: bool = False) -> Predicate:
+    """Make function that checks environment value for string marker.
+
+    If `reverse` is True then the value is on the left side of the operator.
+    """
+    compare = OPERATORS.get(op)
+    if compare is None:
+        raise undefined_comparison(op=op, value=value)
+    if reverse:
+        return lambda env_value: compare(value, env_value)
+    return lambda env_value: compare(env_value, value)
+
+
+def version_predicate(op: str, value: str, key: Optional[VersionKey] = None) -> Predicate:
+    """Make function that checks environment value for version marker.
+
+    Like `packaging` does, values are compared as PEP-440 versions when possible
+    and as strings otherwise. The `key` is the version key of `value`.
+    """
+    # external
+    from packaging.specifiers import InvalidSpecifier, Specifier
+
+    try:
+        spec = Specifier(op + value, prereleases=True)
+    except InvalidSpecifier:
+        return string_predicate(op=op, value=value)
+
+    fallback = OPERATORS.get(op)
+    compare = None
+    if op in COMPARISONS and key is not None:
+        compare = OPERATORS[op]
+
+    def check(env_value: str) -> bool:
+        # PEP-440 special cases for comparison operators affect only
+        # pre-, post-, dev- and local versions, final releases are compared by keys
+        if compare is not None:
+            env_key = get_version_key(env_value)
+            if env_key is not None:
+                return compare(env_key, key)
+        env_version = parse_version(env_value)
+        if env_version is None:
+            if fallback is None:
+                raise undefined_comparison(op=op, value=env_value)
+            return fallback(env_value, value)
+        return spec.contains(env_version)
+
+    return check
@@ -0,0 +1,193 @@
+# built-in
+from bisect import bisect_left
+from collections import namedtuple
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# `tree` is TreeStats of the result if the operation produces a tree,
+# `error` is the exception raised by the operation.
+Event = namedtuple('Event', ['name', 'duration', 'tree', 'error'])
+TreeStats = namedtuple('TreeStats', ['nodes', 'depth', 'variables'])
+Callback = Callable[[Event], Any]
+
+# name of `Markers` attribute -> (event name, does it produce a tree)
+TARGETS = (
+    ('_parse', 'parse', True),
+    ('_convert', 'convert', True),
+    ('_merge', 'merge', True),
+    ('_reduce', 'reduce', True),
+    ('simplify', 'simplify', True),
+    ('get_version', 'get_version', False),
+    ('__str__', 'str', False),
+)
+
+# upper bounds of histogram buckets in microseconds, the last bucket is unbounded
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 100000)
+
+
+def get_tree_stats(tree) -> Optional[TreeStats]:
+    """Get size of the tree, `Markers` or node. Returns None for anything else.
+    """
+    tree = getattr(tree, '_marker', tree)
+    if tree is None:
+        return TreeStats(nodes=0, depth=0, variables=0)
+    if not hasattr(tree, 'depth'):
+        return None
+    variables = getattr(tree, 'variables', None)
+    if variables is None:
+        variables = (tree.variable, )
+    return TreeStats(nodes=tree.size, depth=tree.depth, variables=len(variables))
+
+
+class Instrumentation:
+    """Registry of callbacks that are called after every instrumented `Markers` operation.
+
+    Instrumentation is disabled by default and costs nothing: methods of `Markers`
+    are replaced by measuring wrappers only while it's enabled.
+    Callbacks are called in the thread that did the operation and must be fast.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._callbacks = ()  # type: Tuple[Callback, ...]
+        self._originals = dict()  # type: Dict[str, Any]
+        self._lock = Lock()
+        self._owner = None  # type: Any
+
+    def subscribe(self, callback: Callback) -> Callback:
+        """Register the callback. Returns the callback, so it can be used as a decorator.
+        """
+        with self._lock:
+            self._callbacks += (callback, )
+        return callback
+
+    def unsubscribe(self, callback: Callback) -> None:
+        with self._lock:
+            self._callbacks = tuple(item for item in self._callbacks if item is not callback)
+
+    def enable(self) -> None:
+        # app
+        from ._markers import Markers
+
+        with self._lock:
+            if self.enabled:
+                return
+            for attr, name, produces_tree in TARGETS:
+                original = Markers.__dict__[attr]
+                self._originals[attr] = original
+                setattr(Markers, attr, self._wrap(original, name=name, produces_tree=produces_tree))
+            self._owner = Markers
+            self.enabled = True
+
+    def disable(self) -> None:
+        with self._lock:
+            if not self.enabled:
+                return
+            for attr, original in self._originals.items():
+                setattr(self._owner, attr, original)
+            self._originals.clear()
+            self._owner = None
+            self.enabled = False
+
+    def emit(self, event: Event) -> None:
+        for callback in self._callbacks:
+            callback(event)
+
+    def _wrap(self, original, name: str, produces_tree: bool):
+        func = getattr(original, '__func__', original)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                self.emit(Event(name=name, duration=perf_counter() - start, tree=None, error=exc))
+                raise
+            duration = perf_counter() - start
+            tree = get_tree_stats(result) if produces_tree else None
+            self.emit(Event(name=name, duration=duration, tree=tree, error=None))
+            return result
+
+        # keep the kind of the method
+        if isinstance(original, (staticmethod, classmethod)):
+            return type(original)(wrapper)
+        return wrapper
+
+    def __repr__(self) -> str:
+        return '{}(enabled={}, callbacks={})'.format(type(self).__name__, self.enabled, len(self._callbacks))
+
+
+class Metrics:
+    """Callback that aggregates events into counters and timing histograms.
+
+    ```python
+    metrics = Metrics()
+    Markers.instrumentation.subscribe(metrics)
+    Markers.instrumentation.enable()
+    ...
+    metrics.snapshot()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._data = dict()  # type: Dict[str, Dict[str, Any]]
+
+    def __call__(self, event: Event) -> None:
+        microseconds = event.duration * 10 ** 6
+        with self._lock:
+            data = self._data.get(event.name)
+            if data is None:
+                data = self._data[event.name] = dict(
+                    count=0,
+                    errors=0,
+                    total=0.0,
+                    histogram=[0] * (len(BUCKETS) + 1),
+                    nodes=0,
+                    max_nodes=0,
+                    max_depth=0,
+                    max_variables=0,
+                )
+            data['count'] += 1
+            data['total'] += event.duration
+            data['histogram'][bisect_left(BUCKETS, microseconds)] += 1
+            if event.error is not None:
+                data['errors'] += 1
+            tree = event.tree
+            if tree is not None:
+                data['nodes'] += tree.nodes
+                data['max_nodes'] = max(data['max_nodes'], tree.nodes)
+                data['max_depth'] = max(data['max_depth'], tree.depth)
+                data['max_variables'] = max(data['max_variables'], tree.variables)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of collected metrics by operation name.
+
+        Every operation has `count`, `errors`, `total` time in seconds,
+        `histogram` with counts for every bucket from `buckets`, and for operations
+        that produce trees the total number of `nodes` and maximal size of trees.
+        """
+        with self._lock:
+            result = dict()
+            for name, data in self._data.items():
+                data = dict(data)
+                data['histogram'] = list(data['histogram'])
+                result[name] = data
+            return result
+
+    @property
+    def buckets(self) -> List[float]:
+        """Upper bounds of histogram buckets in microseconds.
+        """
+        return list(BUCKETS) + [float('inf')]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,60 @@
+# built-in
+from threading import Lock
+from weakref import WeakValueDictionary
+
+
+class InternTable:
+    """Weak-value table of markers nodes.
+
+    When enabled, all structurally equal nodes created after that
+    are the same object, so comparison of them is an identity check.
+    Operations with the same children in a different order are equal
+    but different objects, so they are printed as they were written.
+    Interned nodes are shared and must never be mutated in place.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._nodes = WeakValueDictionary()  # type: WeakValueDictionary
+        self._lock = Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def intern(self, node):
+        """Get the node that is equal to the given one or remember the given node.
+        """
+        key = node._intern_key
+        with self._lock:
+            old = self._nodes.get(key)
+            if old is not None:
+                return old
+            self._nodes[key] = node
+        return node
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __repr__(self) -> str:
+        return '{}(enabled={}, size={})'.format(type(self).__name__, self.enabled, len(self))
+
+
+intern_table = InternTable()
+
+
+class InternMeta(type):
+    """Metaclass that passes every created node through the intern table.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        node = super().__call__(*args, **kwargs)
+        if intern_table.enabled:
+            return intern_table.intern(node)
+        return node
@@ -1,47 +1,102 @@
 # built-in
-from typing import Optional, Set
-
-# external
-import attr
-from packaging.markers import Value, Variable
+from sys import intern
+from typing import Callable, Optional, Set
 
 # app
-from .._cached_property import cached_property
-from .._constants import ALIASES
-
-
-@attr.s(eq=False, order=False)
-class BaseMarker:
-    lhs = attr.ib()
-    op = attr.ib()
-    rhs = attr.ib()
-
-    def __attrs_post_init__(self):
-        # change alias to good value
-        if isinstance(self.lhs, Variable):
-            value = ALIASES.get(self.lhs.value)
-            if value is not None:
-                self.lhs = Variable(value=value)
-        if isinstance(self.rhs, Variable):
-            value = ALIASES.get(self.rhs.value)
-            if value is not None:
-                self.rhs = Variable(value=value)
-
-    @cached_property
-    def variable(self) -> str:
-        if isinstance(self.lhs, Variable):
-            return self.lhs.value
-        return self.rhs.value
+from .._constants import ALIASES, SYMMETRIC_OPERATIONS
+from .._evaluate import Environment, Predicate, undefined_name
+from .._intern import InternMeta, intern_table
+
+
+# positions of the variable and the value in the marker
+VARIABLE_VALUE = 0      # os_name == "posix"
+VALUE_VARIABLE = 1      # "posix" in os_name
+VARIABLE_VARIABLE = 2   # os_name == sys_platform
+
+
+class BaseMarker(metaclass=InternMeta):
+    """Single marker: comparison of the variable with the value.
+
+    Only interned strings are stored. `lhs`, `op` and `rhs` are computed
+    on every access and kept only for compatibility, so `packaging.markers`
+    is imported only when they are used.
+    """
+    __slots__ = ('variable', 'operator', 'value', 'layout', '_hash', '__weakref__')
+
+    # relative cost of evaluation, cheap checks are evaluated first
+    cost = 1
+    # a leaf is a tree of one node
+    size = 1
+    depth = 1
+
+    def __init__(self, lhs, op, rhs):
+        # external
+        from packaging.markers import Variable
+
+        if isinstance(lhs, Variable):
+            variable = lhs.value
+            value = rhs.value
+            if isinstance(rhs, Variable):
+                layout = VARIABLE_VARIABLE
+                value = ALIASES.get(value, value)
+            else:
+                layout = VARIABLE_VALUE
+        else:
+            variable = rhs.value
+            value = lhs.value
+            layout = VALUE_VARIABLE
+        self._setup(
+            variable=ALIASES.get(variable, variable),
+            operator=op.value,
+            value=value,
+            layout=layout,
+        )
+
+    @classmethod
+    def from_parts(cls, variable: str, operator: str, value: str, layout: int = VARIABLE_VALUE):
+        """Make marker from strings without `packaging` wrappers.
+        """
+        marker = cls.__new__(cls)
+        marker._setup(variable=variable, operator=operator, value=value, layout=layout)
+        if intern_table.enabled:
+            return intern_table.intern(marker)
+        return marker
+
+    def _setup(self, variable: str, operator: str, value: str, layout: int) -> None:
+        self.variable = intern(variable)
+        self.operator = intern(operator)
+        self.value = intern(value)
+        self.layout = layout
+        self._hash = hash(self._key)
+
+    # compatibility with `packaging`-based nodes
+
+    @property
+    def lhs(self):
+        # external
+        from packaging.markers import Value, Variable
+
+        if self.layout == VALUE_VARIABLE:
+            return Value(self.value)
+        return Variable(self.variable)
+
+    @property
+    def op(self):
+        # external
+        from packaging.markers import Op
+
+        return Op(self.operator)
 
     @property
-    def operator(self) -> str:
-        return self.op.value
+    def rhs(self):
+        # external
+        from packaging.markers import Value, Variable
 
-    @cached_property
-    def value(self) -> str:
-        if isinstance(self.rhs, Value):
-            return self.rhs.value
-        return self.lhs.value
+        if self.layout == VARIABLE_VALUE:
+            return Value(self.value)
+        if self.layout == VALUE_VARIABLE:
+            return Variable(self.variable)
+        return Variable(self.value)
 
     # interfaces
 
@@ -54,18 +109,74 @@ class BaseMarker:
     def get_strings(self, name: str) -> Set[str]:
         raise NotImplementedError
 
+    def _predicate(self) -> Predicate:
+        raise NotImplementedError
+
+    # public methods
+
+    def compile(self) -> Callable[[Environment], bool]:
+        """Make function that checks if the marker matches the given environment.
+        """
+        predicate = self._predicate()
+        variable = self.variable
+
+        def check(env: Environment) -> bool:
+            try:
+                value = env[variable]
+            except KeyError:
+                raise undefined_name(variable)
+            return predicate(value)
+
+        return check
+
+    def mask(self, environments) -> int:
+        """Get bitmask of `Environments` that match the marker.
+        """
+        return environments.leaf_mask(self)
+
+    # private methods
+
+    @property
+    def _key(self) -> tuple:
+        """Identifier of the marker: equal markers have equal keys.
+        """
+        layout = self.layout
+        # `"posix" == os_name` is the same as `os_name == "posix"`
+        if layout == VALUE_VARIABLE and self.operator in SYMMETRIC_OPERATIONS:
+            layout = VARIABLE_VALUE
+        return (type(self), self.variable, self.operator, self.value, layout)
+
+    @property
+    def _intern_key(self) -> tuple:
+        """Identifier of the interned marker. Unlike `_key`, it keeps the side of the variable.
+        """
+        return (type(self), self.variable, self.operator, self.value, self.layout)
+
     # magic methods
 
+    def __str__(self):
+        if self.layout == VARIABLE_VALUE:
+            template = '{var} {op} "{value}"'
+        elif self.layout == VALUE_VARIABLE:
+            template = '"{value}" {op} {var}'
+        else:
+            template = '{var} {op} {value}'
+        return template.format(var=self.variable, op=self.operator, value=self.value)
+
+    def __repr__(self) -> str:
+        return '{}(lhs={!r}, op={!r}, rhs={!r})'.format(type(self).__name__, self.lhs, self.op, self.rhs)
+
+    def __reduce__(self):
+        return (type(self).from_parts, (self.variable, self.operator, self.value, self.layout))
+
     def __hash__(self) -> int:
-        return hash((self.lhs.value, self.op.value, self.rhs.value))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, BaseMarker):
             return NotImplemented
-        if self.variable != other.variable:
-            return False
-        if self.operator != other.operator:
-            return False
-        if self.value != other.value:
+        if self._hash != other._hash:
             return False
-        return True
+        return self._key == other._key
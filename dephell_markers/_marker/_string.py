@@ -1,14 +1,13 @@
 # built-in
 from typing import Optional, Set
 
-# external
-from packaging.markers import Op, Value
-
 # app
-from ._base import BaseMarker
+from .._evaluate import Predicate, string_predicate
+from ._base import VALUE_VARIABLE, BaseMarker
 
 
 class StringMarker(BaseMarker):
+    __slots__ = ()
 
     def get_string(self, name: str) -> Optional[str]:
         if name != self.variable:
@@ -26,31 +25,28 @@ class StringMarker(BaseMarker):
             return set()
         return {string}
 
-    def __str__(self):
-        if isinstance(self.lhs, Value):
-            template = '"{lhs}" {op} {rhs}'
-        else:
-            template = '{lhs} {op} "{rhs}"'
-        return template.format(
-            lhs=self.lhs.value,
-            op=self.op.value,
-            rhs=self.rhs.value,
+    def _predicate(self) -> Predicate:
+        return string_predicate(
+            op=self.operator,
+            value=self.value,
+            reverse=self.layout == VALUE_VARIABLE,
         )
 
     def __add__(self, other):
-        if self.lhs.value != other.lhs.value:
+        if self.variable != other.variable or self.layout != other.layout:
             return NotImplemented
-        if self.rhs.value != other.rhs.value:
+        if self.value != other.value:
             return NotImplemented
 
-        if self.op.value == other.op.value:
+        if self.operator == other.operator:
             return self
-        operations = {self.op.value, other.op.value}
+        operations = {self.operator, other.operator}
         if operations in ({'>=', '=='}, {'<=', '=='}, {'>=', '<='}):
-            return type(self)(
-                lhs=self.lhs,
-                op=Op(value='=='),
-                rhs=self.rhs,
+            return type(self).from_parts(
+                variable=self.variable,
+                operator='==',
+                value=self.value,
+                layout=self.layout,
             )
 
         return NotImplemented
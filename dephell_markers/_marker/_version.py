@@ -1,24 +1,30 @@
 # built-in
 from typing import Optional, Set
 
-# external
-from dephell_specifier import Specifier
-from packaging.markers import Op, Value
-from packaging.version import parse
-
 # app
-from .._cached_property import cached_property
-from .._constants import REVERSED_OPERATIONS
-from ._base import BaseMarker
+from .._constants import MERGED_OPERATIONS, REVERSED_OPERATIONS
+from .._evaluate import Predicate, version_predicate
+from .._versions import VersionKey, get_specifier, get_version_key, parse_any_version
+from ._base import VALUE_VARIABLE, VARIABLE_VALUE, BaseMarker
+
+
+# the version key isn't computed yet
+NOT_SET = object()
 
 
 class VersionMarker(BaseMarker):
+    __slots__ = ('_version', '_version_key')
+
+    cost = 2
 
-    def __attrs_post_init__(self):
-        if isinstance(self.lhs, Value):
-            self.lhs, self.rhs = self.rhs, self.lhs
-            self.op = Op(value=REVERSED_OPERATIONS[self.op.value])
-        super().__attrs_post_init__()
+    def _setup(self, variable: str, operator: str, value: str, layout: int) -> None:
+        # `"2.7" < python_version` -> `python_version > "2.7"`
+        if layout == VALUE_VARIABLE:
+            operator = REVERSED_OPERATIONS[operator]
+            layout = VARIABLE_VALUE
+        self._version = None
+        self._version_key = NOT_SET
+        super()._setup(variable=variable, operator=operator, value=value, layout=layout)
 
     def get_string(self, name: str) -> Optional[str]:
         return None
@@ -31,28 +37,78 @@ class VersionMarker(BaseMarker):
             return None
         return self.operator + self.value
 
-    @cached_property
+    @property
     def version(self):
-        return parse(self.value)
+        version = self._version
+        if version is None:
+            version = self._version = parse_any_version(self.value)
+        return version
 
-    @cached_property
+    @property
+    def version_key(self) -> Optional[VersionKey]:
+        """Comparable key of the version if it's a final release, None otherwise.
+        """
+        key = self._version_key
+        if key is NOT_SET:
+            key = self._version_key = get_version_key(self.value)
+        return key  # type: ignore
+
+    @property
     def specifier(self):
-        return Specifier(self.op.value + self.value)
+        """`dephell_specifier.Specifier` shared between all markers with the same operator and version.
+        """
+        return get_specifier(self.operator, self.value)
 
-    def __str__(self):
-        return '{lhs} {op} "{rhs}"'.format(
-            lhs=self.lhs.value,
-            op=self.op.value,
-            rhs=self.rhs.value,
-        )
+    def _predicate(self) -> Predicate:
+        return version_predicate(op=self.operator, value=self.value, key=self.version_key)
 
     def __add__(self, other: 'VersionMarker'):
+        left_key = self.version_key
+        right_key = other.version_key
+        if left_key is None or right_key is None:
+            return self._add_specifiers(other)
+        operators = frozenset({self.operator, other.operator})
+        if operators not in MERGED_OPERATIONS:
+            return self._add_specifiers(other)
+
+        # both versions are equal
+        if left_key == right_key:
+            operator = MERGED_OPERATIONS[operators]
+            if operator is None:
+                return NotImplemented
+            return self._from_version(operator, self)
+
+        # empty interval or closed interval
+        if self.operator in {'>', '>='} and other.operator in {'<', '<='}:
+            return NotImplemented
+        if other.operator in {'>', '>='} and self.operator in {'<', '<='}:
+            return NotImplemented
+
+        # open interval
+        if left_key < right_key:
+            left, right = self, other
+        else:
+            left, right = other, self
+        if '>' in left.operator:
+            return self._from_version(right.operator, right)
+        if '<' in right.operator:
+            return self._from_version(left.operator, left)
+        return NotImplemented
+
+    def _add_specifiers(self, other: 'VersionMarker'):
         try:
             spec = self.specifier + other.specifier
         except TypeError:
             return NotImplemented
-        return type(self)(
-            lhs=self.lhs,
-            op=Op(value=spec.operator),
-            rhs=Value(value=str(spec.version)),
+        return type(self).from_parts(
+            variable=self.variable,
+            operator=spec.operator,
+            value=str(spec.version),
+        )
+
+    def _from_version(self, operator: str, marker: 'VersionMarker') -> 'VersionMarker':
+        return type(self).from_parts(
+            variable=self.variable,
+            operator=operator,
+            value=str(marker.version),
         )
@@ -1,23 +1,55 @@
 # built-in
+from collections import OrderedDict
 from copy import copy
-from typing import Optional, Set, Type, Union
-
-# external
-from dephell_specifier import RangeSpecifier
-from packaging import markers as packaging
-from packaging.markers import Op, Value, Variable
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Type, Union
 
 # app
+from ._cache import ParseCache
 from ._constants import STRING_VARIABLES, VERSION_VARIABLES
+from ._environments import Environments
+from ._evaluate import Environment, get_environment
+from ._instrument import instrumentation
+from ._intern import intern_table
 from ._marker import BaseMarker, StringMarker, VersionMarker
 from ._operation import AndMarker, Operation, OrMarker
+from ._serialize import dumps, loads
+from ._simplify import NEVER, simplify
+from ._solver import implies, is_disjoint, is_satisfiable
+from ._specialize import specialize
+from ._parser import convert_single_marker, deduplicate, join, parse
+
+
+if TYPE_CHECKING:
+    # external
+    from dephell_specifier import RangeSpecifier
+    from packaging import markers as packaging
+
+    # app
+    from ._disk_cache import DiskCache  # noqa: F401
+
+
+def _match_any(env: Environment) -> bool:
+    return True
 
 
 class Markers:
-    def __init__(self, markers: Union[list, str, 'Markers', packaging.Marker, None] = None):
+    # parsed trees shared between all Markers created from the same string
+    cache = ParseCache()
+    # when enabled, equal nodes are the same object
+    intern_table = intern_table
+    # callbacks for operations, disabled by default
+    instrumentation = instrumentation
+    # persistent cache shared between processes, disabled by default
+    disk_cache = None   # type: Optional[DiskCache]
+
+    def __init__(self, markers: Union[list, str, 'Markers', 'packaging.Marker', None] = None):
+        self._compiled = None   # type: Optional[Tuple[Any, Callable[[Environment], bool]]]
         if not markers:
             self._marker = None
             return
+        if isinstance(markers, str):
+            self._marker = self._from_string(markers)
+            return
         markers = self._parse(markers)
         if isinstance(markers, list):
             self._marker = self._convert(markers)
@@ -27,16 +59,21 @@ class Markers:
     # properties
 
     @property
-    def variables(self) -> Set[str]:
+    def variables(self) -> FrozenSet[str]:
         if self._marker is None:
-            return set()
+            return frozenset()
         if isinstance(self._marker, BaseMarker):
-            return {self._marker.variable}
+            return frozenset({self._marker.variable})
         return self._marker.variables
 
     @property
     def compat(self) -> bool:
-        for variable in self.variables:
+        # only variables of the top-level single markers are checked
+        if isinstance(self._marker, Operation):
+            variables = frozenset(self._marker._leaves)
+        else:
+            variables = self.variables
+        for variable in variables:
             if variable in STRING_VARIABLES:
                 if self.get_string(variable) is None:
                     return False
@@ -44,16 +81,19 @@ class Markers:
                 if self.get_version(variable) is None:
                     return False
 
-        if 'python_version' in self.variables:
+        if 'python_version' in variables:
             python = self.python_version
             if python is not None and not python.python_compat:
                 return False
         return True
 
     @property
-    def python_version(self) -> Optional[RangeSpecifier]:
+    def python_version(self) -> Optional['RangeSpecifier']:
         value = self.get_version('python_version')
         if value is not None:
+            # external
+            from dephell_specifier import RangeSpecifier
+
             return RangeSpecifier(value)
         return None
 
@@ -82,7 +122,7 @@ class Markers:
         if self._marker is None:
             return
         if isinstance(self._marker, Operation):
-            self._marker.remove(name=name)
+            self._marker = self._marker.remove(name=name)
             return
         if self._marker.variable == name:
             self._marker = None
@@ -92,6 +132,99 @@ class Markers:
         self.remove(name=name)
         return strings
 
+    def compile(self) -> Callable[[Environment], bool]:
+        """Make function that checks if markers match the given environment.
+
+        Unlike `evaluate`, the function expects a complete environment
+        and doesn't fill missed values from the current one.
+        """
+        if self._compiled is not None and self._compiled[0] is self._marker:
+            return self._compiled[1]
+        if self._marker is None:
+            check = _match_any   # type: Callable[[Environment], bool]
+        else:
+            check = self._marker.compile()
+        self._compiled = (self._marker, check)
+        return check
+
+    def evaluate(self, environment: Optional[Environment] = None) -> bool:
+        """Check if markers match the given environment.
+
+        Missed values are taken from the current environment, `extra` is empty by default.
+        """
+        return self.compile()(get_environment(environment))
+
+    def evaluate_many(self, environments: Union[Environments, Iterable[Optional[Environment]]]) -> List[bool]:
+        """Check markers against every given environment.
+
+        Missed values are taken from the current environment
+        unless `Environments` instance is passed.
+        """
+        if not isinstance(environments, Environments):
+            environments = Environments(environments)
+        if self._marker is None or not environments.size:
+            return [True] * environments.size
+        return environments.unpack(self._marker.mask(environments))
+
+    def simplify(self) -> 'Markers':
+        """Get equivalent markers in the simplified canonical form.
+
+        Redundant nodes are absorbed, version ranges are merged, and nodes are sorted,
+        so equivalent markers usually have the same string representation.
+        Markers that always match are simplified to empty markers.
+
+        Versions are compared as ranges of final releases, so the result can differ
+        from the original markers for pre-releases: `python_full_version < "3.13"
+        or python_full_version >= "3.13"` is simplified to empty markers,
+        but doesn't match `3.13.0rc1` because of PEP-440 rules for pre-releases.
+        """
+        new = type(self)()
+        if self._marker is None:
+            return new
+        node = simplify(self._marker)
+        if node is True:
+            return new
+        if node is False:
+            return type(self)(NEVER)
+        new._marker = node
+        return new
+
+    def specialize(self, environment: Environment) -> Union['Markers', bool]:
+        """Get markers for the partially known environment.
+
+        Single markers for variables from the given environment are replaced by their results.
+        Returns True or False if the result doesn't depend on unknown variables,
+        and the residual markers otherwise. Unlike `evaluate`, missed values
+        aren't taken from the current environment.
+        """
+        if self._marker is None:
+            return True
+        node = specialize(self._marker, environment)
+        if isinstance(node, bool):
+            return node
+        new = type(self)()
+        new._marker = node
+        return new
+
+    def is_satisfiable(self) -> bool:
+        """Check if markers can match any environment.
+
+        False means that markers never match. True means only that
+        a contradiction isn't found: variables are considered independent
+        and unsupported comparisons are considered satisfiable.
+        """
+        return is_satisfiable(self._marker)
+
+    def implies(self, other: Union['Markers', BaseMarker, Operation, str]) -> bool:
+        """Check if every environment that matches markers matches the other ones too.
+        """
+        return implies(self._marker, self._get_node(other))
+
+    def is_disjoint(self, other: Union['Markers', BaseMarker, Operation, str]) -> bool:
+        """Check if markers and the other ones can't match the same environment.
+        """
+        return is_disjoint(self._marker, self._get_node(other))
+
     def add(self, *, name: str, value, operator: str = '==') -> BaseMarker:
         if operator in {'in', 'not in'}:
             msg = 'unsupported operation: {}'
@@ -101,31 +234,95 @@ class Markers:
             marker_cls = StringMarker   # type: Type[BaseMarker]
         elif name in VERSION_VARIABLES:
             marker_cls = VersionMarker
-        marker = marker_cls(
-            lhs=packaging.Variable(name),
-            op=packaging.Op(operator),
-            rhs=packaging.Value(value),
-        )
+        marker = marker_cls.from_parts(variable=name, operator=operator, value=value)
         self &= marker
         return marker
 
+    def to_bytes(self) -> bytes:
+        """Encode markers into compact binary form.
+
+        Loading markers from it is much faster than parsing the string.
+        """
+        return dumps(self._marker)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Markers':
+        """Load markers from `to_bytes` result.
+        """
+        new = cls()
+        new._marker = loads(data)
+        return new
+
+    @classmethod
+    def union_all(cls, markers: Iterable[Union['Markers', BaseMarker, Operation, str, None]]) -> 'Markers':
+        """Join all given markers by `or` at once.
+
+        It is the same as `|=` in a loop but takes linear time.
+        Empty markers are skipped as they are by `|=`.
+        """
+        return cls._reduce(markers, container=OrMarker)
+
+    @classmethod
+    def intersection_all(cls, markers: Iterable[Union['Markers', BaseMarker, Operation, str, None]]) -> 'Markers':
+        """Join all given markers by `and` at once.
+
+        It is the same as `&=` in a loop but takes linear time.
+        """
+        return cls._reduce(markers, container=AndMarker)
+
     # private methods
 
+    @classmethod
+    def _reduce(cls, markers: Iterable, container: Type[Operation]) -> 'Markers':
+        # used as ordered set
+        nodes = OrderedDict()  # type: Dict[Union[Operation, BaseMarker], None]
+        for marker in markers:
+            node = cls._get_node(marker)
+            if node is None:
+                continue
+            if type(node) is container:
+                nodes.update(OrderedDict.fromkeys(node.nodes))   # type: ignore
+            else:
+                nodes[node] = None
+
+        new = cls()
+        if not nodes:
+            return new
+        if len(nodes) == 1:
+            new._marker = next(iter(nodes))
+        else:
+            new._marker = container(*nodes)
+        return new
+
+    @classmethod
+    def _from_string(cls, markers: str) -> Union[Operation, BaseMarker]:
+        key = cls.cache.normalize(markers)
+        marker = cls.cache.get(key)
+        if marker is not None:
+            return marker
+
+        disk_cache = cls.disk_cache
+        if disk_cache is not None:
+            data = disk_cache.get(key)
+            if data is not None:
+                try:
+                    marker = loads(data)
+                except ValueError:
+                    marker = None
+        if marker is None:
+            marker = cls._parse(markers)
+            if disk_cache is not None:
+                disk_cache.set(key, dumps(marker))
+        cls.cache.set(key, marker)
+        return marker
+
     @staticmethod
-    def _parse(markers: Union[list, str, 'Markers', packaging.Marker]):
+    def _parse(markers: Union[list, str, 'Markers', 'packaging.Marker']):
         if isinstance(markers, list):
             return markers
 
         if isinstance(markers, str):
-            # https://github.com/pypa/packaging/blob/master/packaging/markers.py
-            try:
-                return packaging._coerce_parse_result(packaging.MARKER.parseString(markers))
-            except packaging.ParseException as e:
-                err_str = 'invalid marker: {0!r}, parse error at {1!r}'.format(
-                    markers,
-                    markers[e.loc:e.loc + 8],
-                )
-                raise packaging.InvalidMarker(err_str)
+            return parse(markers)
 
         if hasattr(markers, '_markers'):
             return markers._markers  # type: ignore
@@ -156,51 +353,18 @@ class Markers:
                 continue
 
             raise LookupError('invalid node type')
-
-        new_groups = []
-        for group in groups:
-            if len(group) == 1:
-                new_groups.append(group[0])
-            elif len(group) > 1:
-                new_groups.append(AndMarker(*cls._deduplicate(group)))
-
-        if len(new_groups) == 1:
-            return new_groups[0]
-        return OrMarker(*cls._deduplicate(new_groups))
+        return join(groups)
 
     @staticmethod
-    def _convert_single_marker(lhs: Union[Value, Variable], op: Op,
-                               rhs: Union[Value, Variable]) -> Union[Operation, BaseMarker]:
-        var = lhs.value if type(lhs) is Variable else rhs.value
-        if var in STRING_VARIABLES:
-            return StringMarker(lhs=lhs, op=op, rhs=rhs)
-
-        if var not in VERSION_VARIABLES:
-            raise LookupError('unknown marker: {}'.format(var))
-
-        if op.value == 'in' and type(rhs) is Value:
-            values = rhs.value.split()
-            markers = [VersionMarker(lhs=lhs, op=Op('=='), rhs=Value(value)) for value in values]
-            return OrMarker(*markers)
-
-        if op.value in {'in' 'not in'}:
-            msg = 'unsupported operation for version marker {}: {}'
-            raise ValueError(msg.format(var, op.value))
-
-        return VersionMarker(lhs=lhs, op=op, rhs=rhs)
+    def _get_node(other: Union['Markers', BaseMarker, Operation, str, None]) -> Union[Operation, BaseMarker, None]:
+        if isinstance(other, str):
+            other = Markers(other)
+        if isinstance(other, Markers):
+            return other._marker
+        return other
 
-    @staticmethod
-    def _deduplicate(group: list) -> list:
-        new_group = []  # type: list
-        for node in group:
-            for merged_node in new_group:
-                if type(node) is not type(merged_node):
-                    continue
-                if merged_node == node:
-                    break
-            else:
-                new_group.append(node)
-        return new_group
+    _convert_single_marker = staticmethod(convert_single_marker)
+    _deduplicate = staticmethod(deduplicate)
 
     def _merge(self, other, container) -> 'Markers':
         if isinstance(other, Markers):
@@ -212,9 +376,10 @@ class Markers:
         if other is None:
             return self
 
-        # do not add new node if it's already added
-        if isinstance(self._marker, Operation):
-            if other in self._marker.nodes:
+        # do not add new node if it's already added.
+        # `a or b` has `b` as a child, but `(a or b) and b` isn't the same.
+        if isinstance(self._marker, Operation) and type(self._marker) is container:
+            if other in self._marker:
                 return self
         if isinstance(self._marker, BaseMarker) and isinstance(other, BaseMarker):
             if other == self._marker:
@@ -227,6 +392,15 @@ class Markers:
 
     # magic methods
 
+    def __reduce__(self):
+        return (type(self).from_bytes, (self.to_bytes(), ))
+
+    def __copy__(self) -> 'Markers':
+        new = type(self).__new__(type(self))
+        new._marker = self._marker
+        new._compiled = self._compiled
+        return new
+
     def __and__(self, other: Union['Markers', BaseMarker, Operation]) -> 'Markers':
         """self & other
         """
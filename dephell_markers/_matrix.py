@@ -0,0 +1,146 @@
+# built-in
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# app
+from ._environments import Environments
+from ._evaluate import Environment, get_environment, undefined_name
+from ._marker import BaseMarker
+from ._markers import Markers
+from ._operation import AndMarker, Operation
+
+
+Node = Union[Operation, BaseMarker]
+# distinct values of the variable and index of the value for every environment, -1 if missed
+Column = Tuple[List[str], Any]
+
+
+def has_numpy() -> bool:
+    try:
+        # external
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def evaluate_matrix(markers: Iterable[Union[Markers, Node, str, None]],
+                    environments: Iterable[Optional[Environment]],
+                    fill: bool = True, use_numpy: Optional[bool] = None):
+    """Evaluate every marker against every environment.
+
+    Returns matrix of booleans with a row for every marker and a column for every environment:
+    `numpy.ndarray` if NumPy is installed and a list of lists otherwise.
+    `use_numpy` forces one of the implementations.
+
+    If `fill` is True then missed values are taken from the current environment.
+    """
+    nodes = [_get_node(marker) for marker in markers]
+    environments = list(environments)
+    if use_numpy is None:
+        use_numpy = has_numpy()
+    if use_numpy:
+        return _evaluate_numpy(nodes, environments, fill=fill)
+    return _evaluate_python(nodes, environments, fill=fill)
+
+
+def _get_node(marker: Union[Markers, Node, str, None]) -> Optional[Node]:
+    if marker is None or isinstance(marker, (Operation, BaseMarker)):
+        return marker
+    if not isinstance(marker, Markers):
+        marker = Markers(marker)
+    return marker._marker
+
+
+def _evaluate_python(nodes: List[Optional[Node]], environments: List[Optional[Environment]],
+                     fill: bool) -> List[List[bool]]:
+    """Evaluate markers with bitmasks of `Environments`.
+    """
+    columns = Environments(environments, fill=fill)
+    matrix = []
+    for node in nodes:
+        if node is None or not columns.size:
+            matrix.append([True] * columns.size)
+        else:
+            matrix.append(columns.unpack(node.mask(columns)))
+    return matrix
+
+
+def _evaluate_numpy(nodes: List[Optional[Node]], environments: List[Optional[Environment]], fill: bool):
+    """Evaluate markers with NumPy arrays.
+
+    Every variable is encoded as an array of indices of distinct values.
+    Every single marker is checked once for every distinct value,
+    and the result for all environments is taken from this lookup table.
+    Then results are combined with vectorized boolean operations.
+    """
+    # external
+    import numpy
+
+    variables = set()  # type: Set[str]
+    for node in nodes:
+        if node is not None:
+            _collect_variables(node, variables)
+    columns = _encode(environments, variables, fill=fill)
+
+    size = len(environments)
+    matrix = numpy.ones((len(nodes), size), dtype=bool)
+    cache = dict()  # type: Dict[Node, Any]
+    for index, node in enumerate(nodes):
+        if node is not None:
+            matrix[index] = _evaluate_node(node, columns, cache, size)
+    return matrix
+
+
+def _encode(environments: List[Optional[Environment]], variables: Set[str], fill: bool) -> Dict[str, Column]:
+    # external
+    import numpy
+
+    default = get_environment() if fill else dict()
+    columns = dict()
+    for name in variables:
+        values = dict()  # type: Dict[str, int]
+        codes = numpy.empty(len(environments), dtype=numpy.intp)
+        for index, environment in enumerate(environments):
+            value = (environment or default).get(name, default.get(name))
+            if value is None:
+                codes[index] = -1
+                continue
+            code = values.get(value)
+            if code is None:
+                code = values[value] = len(values)
+            codes[index] = code
+        columns[name] = (list(values), codes)
+    return columns
+
+
+def _evaluate_node(node: Node, columns: Dict[str, Column], cache: Dict[Node, Any], size: int):
+    # external
+    import numpy
+
+    result = cache.get(node)
+    if result is not None:
+        return result
+
+    if isinstance(node, BaseMarker):
+        values, codes = columns[node.variable]
+        if size and codes.min() < 0:
+            raise undefined_name(node.variable)
+        predicate = node._predicate()
+        table = numpy.fromiter((predicate(value) for value in values), dtype=bool, count=len(values))
+        result = table[codes]
+    else:
+        results = [_evaluate_node(child, columns, cache, size) for child in node.nodes]
+        if isinstance(node, AndMarker):
+            result = numpy.logical_and.reduce(results)
+        else:
+            result = numpy.logical_or.reduce(results)
+
+    cache[node] = result
+    return result
+
+
+def _collect_variables(node: Node, variables: Set[str]) -> None:
+    if isinstance(node, Operation):
+        variables.update(node.variables)
+    else:
+        variables.add(node.variable)
@@ -1,7 +1,8 @@
 # built-in
-from typing import Optional, Set, Tuple
+from typing import Callable, FrozenSet, Optional, Tuple
 
 # app
+from .._evaluate import Environment
 from ._base import Operation
 
 
@@ -13,15 +14,24 @@ class AndMarker(Operation):
         # braces is redundant for `and`
         return super().__str__()[1:-1]
 
-    def _get_values(self, name: str) -> Optional[Set[Tuple[str, str]]]:
-        values = set()  # type: Set[Tuple[str, str]]
+    def compile(self) -> Callable[[Environment], bool]:
+        checks = self._compile_nodes()
+
+        def check(env: Environment) -> bool:
+            for node_check in checks:
+                if not node_check(env):
+                    return False
+            return True
+
+        return check
+
+    def mask(self, environments) -> int:
+        result = environments.full
         for node in self.nodes:
-            if isinstance(node, Operation):
-                subvalues = node._get_values(name)
-                if subvalues is not None:
-                    values.union(subvalues)
-            elif node.variable == name:
-                values.add((node.operator, node.value))
-        if values:
-            return values
-        return None
+            result &= node.mask(environments)
+            if not result:
+                break
+        return result
+
+    def _find_values(self, name: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+        return frozenset(self._leaves.get(name, ())) or None
@@ -1,11 +1,20 @@
 # built-in
-from typing import Optional, Set
+from operator import attrgetter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 # app
 from .._cached_property import cached_property
+from .._evaluate import Environment
+from .._intern import InternMeta
 
 
-class Operation:
+class Operation(metaclass=InternMeta):
+    """Immutable node that joins other nodes.
+
+    Nodes are never changed after creation, so they are safely shared
+    between trees and threads, and all modifications return new nodes.
+    Lazy indexes are computed on the first access and never change after that.
+    """
     op = ''
     sep = ''
 
@@ -18,21 +27,93 @@ class Operation:
             else:
                 # if this is single marker or other Operation then just append
                 new_nodes.append(node)
-        self.nodes = new_nodes
+        self.nodes = tuple(new_nodes)   # type: Tuple[Any, ...]
+        self._node_set = frozenset(self.nodes)
+        self._hash = hash(self._key)
 
     @cached_property
-    def variables(self) -> Set[str]:
-        variables = set()  # type: Set[str]
-        for node in self.nodes:
-            if isinstance(node, Operation):
-                variables.union(node.variables)
-            else:
-                variables.add(node.variable)
+    def variables(self) -> FrozenSet[str]:
+        """All variables used in the tree.
+
+        It is computed once from variables of children, so subtrees share it.
+        """
+        variables = frozenset(self._leaves)
+        for node in self._operations:
+            variables |= node.variables
         return variables
 
-    def _get_values(self, name: str):
+    @cached_property
+    def cost(self) -> int:
+        return sum(node.cost for node in self.nodes)
+
+    @cached_property
+    def size(self) -> int:
+        """Number of nodes in the tree, including this one.
+        """
+        return 1 + len(self.nodes) - len(self._operations) + sum(node.size for node in self._operations)
+
+    @cached_property
+    def depth(self) -> int:
+        return 1 + max((node.depth for node in self._operations), default=1)
+
+    @cached_property
+    def _leaves(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Operators and values of the child single markers by variable.
+        """
+        index = dict()  # type: Dict[str, List[Tuple[str, str]]]
+        for node in self.nodes:
+            if not isinstance(node, Operation):
+                index.setdefault(node.variable, []).append((node.operator, node.value))
+        return index
+
+    @cached_property
+    def _operations(self) -> Tuple['Operation', ...]:
+        return tuple(node for node in self.nodes if isinstance(node, Operation))
+
+    @cached_property
+    def _strings(self) -> Dict[str, FrozenSet[str]]:
+        """Values of all single markers in the tree with `==` operator by variable.
+        """
+        index = dict()  # type: Dict[str, FrozenSet[str]]
+        for variable, values in self._leaves.items():
+            strings = frozenset(value for op, value in values if op == '==')
+            if strings:
+                index[variable] = strings
+        for node in self._operations:
+            for variable, strings in node._strings.items():
+                index[variable] = index.get(variable, frozenset()) | strings
+        return index
+
+    @cached_property
+    def _values(self) -> Dict[str, Optional[FrozenSet[Tuple[str, str]]]]:
+        return dict()
+
+    def _get_values(self, name: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        # the first stored result wins if threads race
+        return self._values.setdefault(name, self._find_values(name))
+
+    def _find_values(self, name: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+        raise NotImplementedError
+
+    def compile(self) -> Callable[[Environment], bool]:
+        """Make function that checks if the marker matches the given environment.
+        """
+        raise NotImplementedError
+
+    def mask(self, environments) -> int:
+        """Get bitmask of `Environments` that match the marker.
+        """
         raise NotImplementedError
 
+    def _compile_nodes(self) -> Tuple[Callable[[Environment], bool], ...]:
+        # the cheapest nodes go first to short-circuit as early as possible
+        nodes = sorted(self.nodes, key=attrgetter('cost'))
+        return tuple(node.compile() for node in nodes)
+
     def get_string(self, name: str) -> Optional[str]:
         values = self._get_values(name=name)
         if values is None:
@@ -61,35 +142,70 @@ class Operation:
         return self.sep.join(sorted(op + val for op, val in values))
 
     def get_strings(self, name: str) -> Set[str]:
-        values = set()
-        for node in self.nodes:
-            if isinstance(node, Operation):
-                values.update(node.get_strings(name=name))
-            elif node.variable == name and node.operator == '==':
-                values.add(node.value)
-        return values
+        return set(self._strings.get(name, ()))
+
+    def remove(self, name: str) -> Optional['Operation']:
+        """Get the node without single markers for the given variable.
 
-    def remove(self, name: str) -> None:
+        Untouched children are shared with the new node.
+        Returns the same node if nothing is removed and None if nothing is left.
+        """
         new_nodes = []
+        changed = False
         for node in self.nodes:
             if isinstance(node, Operation):
-                node.remove(name)
-                if node.nodes:
-                    new_nodes.append(node)
+                new_node = node.remove(name)
+                if new_node is not node:
+                    changed = True
+                if new_node is not None:
+                    new_nodes.append(new_node)
+            elif node.variable == name:
+                changed = True
             else:
-                if node.variable != name:
-                    new_nodes.append(node)
-        self.nodes = new_nodes
+                new_nodes.append(node)
+        if not changed:
+            return self
+        if not new_nodes:
+            return None
+        return type(self)(*new_nodes)
+
+    @property
+    def _key(self) -> tuple:
+        """Identifier of the operation: equal operations have equal keys.
+        """
+        return (self.op, self._node_set)
+
+    @cached_property
+    def _intern_key(self) -> tuple:
+        """Identifier of the interned operation.
+
+        Unlike `_key`, it depends on the order of children on all levels,
+        so interning doesn't change how the operation is printed.
+        """
+        return (type(self), tuple(node._intern_key for node in self.nodes))
 
     # magic methods
 
+    def __contains__(self, node) -> bool:
+        """Check if the node is a direct child of the operation.
+        """
+        return node in self._node_set
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Operation):
             return NotImplemented
-        return self.op == other.op and set(self.nodes) == set(other.nodes)
+        if self._hash != other._hash:
+            return False
+        return self._key == other._key
+
+    def __reduce__(self):
+        # lazy indexes aren't pickled
+        return (type(self), self.nodes)
 
     def __hash__(self):
-        return hash(tuple(self.nodes))
+        return self._hash
 
     def __str__(self):
         sep = ' ' + self.op + ' '
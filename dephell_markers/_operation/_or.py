@@ -1,7 +1,8 @@
 # built-in
-from typing import Optional, Set, Tuple
+from typing import Callable, FrozenSet, Optional, Tuple
 
 # app
+from .._evaluate import Environment
 from ._base import Operation
 
 
@@ -9,19 +10,30 @@ class OrMarker(Operation):
     op = 'or'
     sep = ' || '
 
-    def _get_values(self, name: str) -> Optional[Set[Tuple[str, str]]]:
-        values = set()  # type: Set[Tuple[str, str]]
+    def compile(self) -> Callable[[Environment], bool]:
+        checks = self._compile_nodes()
+
+        def check(env: Environment) -> bool:
+            for node_check in checks:
+                if node_check(env):
+                    return True
+            return False
+
+        return check
+
+    def mask(self, environments) -> int:
+        result = 0
         for node in self.nodes:
-            if isinstance(node, Operation):
-                subvalues = node._get_values(name)
-                if subvalues is None:
-                    return None
-                else:
-                    values.union(subvalues)
-            elif node.variable == name:
-                values.add((node.operator, node.value))
-            else:
+            result |= node.mask(environments)
+            if result == environments.full:
+                break
+        return result
+
+    def _find_values(self, name: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+        # all single markers must be for the given variable
+        if set(self._leaves) - {name}:
+            return None
+        for node in self._operations:
+            if node._get_values(name) is None:
                 return None
-        if values:
-            return values
-        return None
+        return frozenset(self._leaves.get(name, ())) or None
@@ -0,0 +1,216 @@
+# built-in
+import re
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+# app
+from ._constants import ALIASES, STRING_VARIABLES, VERSION_VARIABLES
+from ._marker import BaseMarker, StringMarker, VersionMarker
+from ._marker._base import VALUE_VARIABLE, VARIABLE_VALUE, VARIABLE_VARIABLE
+from ._operation import AndMarker, Operation, OrMarker
+
+
+if TYPE_CHECKING:
+    # external
+    from packaging.markers import Op, Value, Variable
+
+
+# https://www.python.org/dev/peps/pep-0508/#grammar
+# Variables and operators are listed in the same order as in `packaging.markers`.
+# The grammar is the same, so every marker accepted by `packaging` is accepted here.
+REX_SPACE = re.compile(r'[ \t\n\r]*')
+REX_TOKEN = re.compile(r"""
+    (?P<lparen>\()
+    |(?P<rparen>\))
+    |"(?P<dquote>[^"\n\r]*)"
+    |'(?P<squote>[^'\n\r]*)'
+    |(?P<variable>
+        implementation_version
+        |platform_python_implementation
+        |implementation_name
+        |python_full_version
+        |platform_release
+        |platform_version
+        |platform_machine
+        |platform_system
+        |python_version
+        |sys_platform
+        |os_name
+        |os\.name
+        |sys\.platform
+        |platform\.version
+        |platform\.machine
+        |platform\.python_implementation
+        |python_implementation
+        |extra
+    )
+    |(?P<op>===|==|>=|<=|!=|~=|>|<|not\ in|in)
+    |(?P<boolop>and|or)
+""", re.VERBOSE)
+
+LPAREN = 'lparen'
+RPAREN = 'rparen'
+VALUE = 'value'
+VARIABLE = 'variable'
+OP = 'op'
+BOOLOP = 'boolop'
+END = 'end'
+ERROR = 'error'
+
+Token = Tuple[str, str, int]    # kind, value, position in the source
+Node = Union[Operation, BaseMarker]
+
+
+class _ParseError(Exception):
+    def __init__(self, position: int):
+        self.position = position
+
+
+def tokenize(source: str) -> List[Token]:
+    tokens = []  # type: List[Token]
+    position = _skip_space(source, 0)
+    size = len(source)
+    while position < size:
+        match = REX_TOKEN.match(source, position)
+        if match is None:
+            # report the error only if the parser reaches this token
+            tokens.append((ERROR, '', position))
+            return tokens
+        kind = match.lastgroup or ''
+        if kind in ('dquote', 'squote'):
+            tokens.append((VALUE, match.group(kind), position))
+        elif kind == VARIABLE:
+            value = match.group(kind)
+            tokens.append((VARIABLE, ALIASES.get(value, value), position))
+        else:
+            tokens.append((kind, match.group(kind), position))
+        position = _skip_space(source, match.end())
+    tokens.append((END, '', size))
+    return tokens
+
+
+def _skip_space(source: str, position: int) -> int:
+    return REX_SPACE.match(source, position).end()  # type: ignore
+
+
+def parse(source: str) -> Node:
+    """Parse markers string into tree of markers.
+
+    Raises `packaging.markers.InvalidMarker` with the same message as
+    the `packaging`-based parser did, including position of the error.
+    """
+    tokens = tokenize(source)
+    try:
+        node, index = _parse_expr(tokens, 0)
+        kind, _, position = tokens[index]
+        if kind != END:
+            raise _ParseError(position)
+    except _ParseError as e:
+        err_str = 'invalid marker: {0!r}, parse error at {1!r}'.format(
+            source,
+            source[e.position:e.position + 8],
+        )
+        # external
+        from packaging.markers import InvalidMarker
+
+        raise InvalidMarker(err_str)
+    return node
+
+
+def _parse_expr(tokens: List[Token], index: int) -> Tuple[Node, int]:
+    node, index = _parse_atom(tokens, index)
+    groups = [[node]]
+    while tokens[index][0] == BOOLOP:
+        # like `packaging` does, if the rest of expression can't be parsed
+        # then the error is reported at the last successfully parsed boolean operator
+        try:
+            node, new_index = _parse_atom(tokens, index + 1)
+        except _ParseError:
+            break
+        if tokens[index][1] == 'or':
+            groups.append([])
+        groups[-1].append(node)
+        index = new_index
+    return join(groups), index
+
+
+def _parse_atom(tokens: List[Token], index: int) -> Tuple[Node, int]:
+    kind, _, position = tokens[index]
+    if kind == LPAREN:
+        node, index = _parse_expr(tokens, index + 1)
+        kind, _, position = tokens[index]
+        if kind != RPAREN:
+            raise _ParseError(position)
+        return node, index + 1
+
+    lhs = tokens[index]
+    if lhs[0] not in (VARIABLE, VALUE):
+        raise _ParseError(lhs[2])
+    op = tokens[index + 1]
+    if op[0] != OP:
+        raise _ParseError(op[2])
+    rhs = tokens[index + 2]
+    if rhs[0] not in (VARIABLE, VALUE):
+        raise _ParseError(rhs[2])
+    if lhs[0] == VARIABLE:
+        layout = VARIABLE_VARIABLE if rhs[0] == VARIABLE else VARIABLE_VALUE
+        node = make_single_marker(variable=lhs[1], operator=op[1], value=rhs[1], layout=layout)
+    else:
+        node = make_single_marker(variable=rhs[1], operator=op[1], value=lhs[1], layout=VALUE_VARIABLE)
+    return node, index + 3
+
+
+def join(groups: List[List[Node]]) -> Node:
+    """Join groups of nodes into tree: `or` between groups and `and` inside of them.
+    """
+    new_groups = []
+    for group in groups:
+        if len(group) == 1:
+            new_groups.append(group[0])
+        elif len(group) > 1:
+            new_groups.append(AndMarker(*deduplicate(group)))
+
+    if len(new_groups) == 1:
+        return new_groups[0]
+    return OrMarker(*deduplicate(new_groups))
+
+
+def convert_single_marker(lhs: Union['Value', 'Variable'], op: 'Op', rhs: Union['Value', 'Variable']) -> Node:
+    # external
+    from packaging.markers import Variable
+
+    if type(lhs) is Variable:
+        layout = VARIABLE_VARIABLE if type(rhs) is Variable else VARIABLE_VALUE
+        return make_single_marker(variable=lhs.value, operator=op.value, value=rhs.value, layout=layout)
+    return make_single_marker(variable=rhs.value, operator=op.value, value=lhs.value, layout=VALUE_VARIABLE)
+
+
+def make_single_marker(variable: str, operator: str, value: str, layout: int = VARIABLE_VALUE) -> Node:
+    if variable in STRING_VARIABLES:
+        return StringMarker.from_parts(variable=variable, operator=operator, value=value, layout=layout)
+
+    if variable not in VERSION_VARIABLES:
+        raise LookupError('unknown marker: {}'.format(variable))
+
+    if operator == 'in' and layout == VARIABLE_VALUE:
+        values = value.split()
+        markers = [VersionMarker.from_parts(variable=variable, operator='==', value=v) for v in values]
+        return OrMarker(*markers)
+
+    if operator in {'in' 'not in'}:
+        msg = 'unsupported operation for version marker {}: {}'
+        raise ValueError(msg.format(variable, operator))
+
+    return VersionMarker.from_parts(variable=variable, operator=operator, value=value, layout=layout)
+
+
+def deduplicate(group: list) -> list:
+    new_group = []  # type: list
+    for node in group:
+        for merged_node in new_group:
+            if type(node) is not type(merged_node):
+                continue
+            if merged_node == node:
+                break
+        else:
+            new_group.append(node)
+    return new_group
@@ -0,0 +1,225 @@
+# built-in
+from collections import OrderedDict, namedtuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# app
+from ._constants import KNOWN_VALUES
+from ._domain import VersionDomain, get_domain
+from ._evaluate import Environment
+from ._marker import BaseMarker, VersionMarker
+from ._markers import Markers
+from ._operation import Operation
+from ._specialize import specialize
+
+
+if TYPE_CHECKING:
+    # external
+    from packaging.version import Version
+
+
+Node = Union[Operation, BaseMarker]
+# results of markers for every environment in the class, in the same order as markers
+Results = Tuple[bool, ...]
+
+# `environment` is a representative of the class: values of variables used in markers
+EnvironmentClass = namedtuple('EnvironmentClass', ['environment', 'results'])
+
+
+class Partition:
+    """Split environments into classes that evaluate all the given markers identically.
+
+    Values of every variable are split into groups that give the same results
+    for all single markers: versions into intervals between versions from markers,
+    and strings into `KNOWN_VALUES`, values from markers, and an empty string
+    for all other values. Then the groups of all variables are combined,
+    and combinations with equal results are merged into one class.
+
+    Variables are considered independent, so some classes can have impossible
+    combinations of values, like `os_name="nt"` with `sys_platform="linux"`.
+    Comparisons with `in` are checked only on values from markers and `KNOWN_VALUES`.
+
+    Markers that don't depend on each other multiply the number of classes,
+    so ValueError is raised if there are more than `max_classes` of them.
+    """
+
+    def __init__(self, markers: Iterable[Union[Markers, Node, str, None]], max_classes: int = 4096):
+        nodes = [Markers._get_node(marker) for marker in markers]
+        self.markers = [_get_markers(node) for node in nodes]
+        self._index = OrderedDict()  # type: Dict[Results, EnvironmentClass]
+        for environment, results in _partition(nodes, max_classes=max_classes):
+            if results not in self._index:
+                self._index[results] = EnvironmentClass(environment=environment, results=results)
+
+    @property
+    def classes(self) -> List[EnvironmentClass]:
+        return list(self._index.values())
+
+    def classify(self, environment: Optional[Environment] = None) -> Optional[EnvironmentClass]:
+        """Get the class of the environment.
+
+        Missed values are taken from the current environment, like `Markers.evaluate` does.
+        Returns None if the environment has a value that isn't covered by the partition,
+        like a part of a string that is checked with `in`.
+        """
+        results = tuple(marker.evaluate(environment) for marker in self.markers)
+        return self._index.get(results)
+
+    def __iter__(self) -> Iterator[EnvironmentClass]:
+        return iter(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return '{}(markers={}, classes={})'.format(type(self).__name__, len(self.markers), len(self))
+
+
+def _get_markers(node: Optional[Node]) -> Markers:
+    markers = Markers()
+    markers._marker = node
+    return markers
+
+
+def _partition(nodes: List[Optional[Node]], max_classes: int) -> Iterator[Tuple[Environment, Results]]:
+    leaves = dict()  # type: Dict[str, Set[BaseMarker]]
+    for node in nodes:
+        if node is not None:
+            _collect_leaves(node, leaves)
+    values = {variable: _get_values(variable, variable_leaves) for variable, variable_leaves in leaves.items()}
+
+    # residual nodes of markers -> environment.
+    # Environments with equal residual nodes are merged, so combinations
+    # of values are expanded only for variables that still matter.
+    classes = OrderedDict()  # type: Dict[tuple, Environment]
+    classes[tuple(True if node is None else node for node in nodes)] = dict()
+    # variables with fewer values go first, so there are fewer classes to expand
+    for variable in sorted(values, key=lambda variable: (len(values[variable]), variable)):
+        new = OrderedDict()  # type: Dict[tuple, Environment]
+        for residuals, environment in classes.items():
+            if not any(variable in _get_variables(node) for node in residuals if not isinstance(node, bool)):
+                new.setdefault(residuals, environment)
+                continue
+            for value in values[variable]:
+                known = {variable: value}
+                key = tuple(
+                    node if isinstance(node, bool) else specialize(node, known)
+                    for node in residuals
+                )
+                if key not in new:
+                    new[key] = dict(environment, **known)
+            if len(new) > max_classes:
+                raise ValueError('too many classes, more than {}'.format(max_classes))
+        classes = new
+
+    # all variables are known, so all residual nodes are constants
+    for residuals, environment in classes.items():
+        yield environment, residuals
+
+
+def _collect_leaves(node: Node, leaves: Dict[str, Set[BaseMarker]]) -> None:
+    if isinstance(node, Operation):
+        for child in node.nodes:
+            _collect_leaves(child, leaves)
+        return
+    leaves.setdefault(node.variable, set()).add(node)
+
+
+def _get_variables(node: Node) -> Set[str]:
+    if isinstance(node, Operation):
+        return node.variables
+    return {node.variable}
+
+
+def _get_values(variable: str, leaves: Set[BaseMarker]) -> List[str]:
+    """Get one value for every group of values that give the same results for all leaves.
+    """
+    # external
+    from packaging.markers import UndefinedComparison
+
+    if any(isinstance(leaf, VersionMarker) for leaf in leaves):
+        candidates = _get_version_candidates(leaves)
+    else:
+        candidates = list(KNOWN_VALUES.get(variable, ()))
+    # literals that aren't valid versions are compared as strings
+    candidates.extend(sorted(leaf.value for leaf in leaves))
+    candidates.append('')
+
+    predicates = [leaf._predicate() for leaf in sorted(leaves, key=str)]
+    groups = OrderedDict()  # type: Dict[Tuple[bool, ...], str]
+    for value in OrderedDict.fromkeys(candidates):
+        try:
+            signature = tuple(predicate(value) for predicate in predicates)
+        except UndefinedComparison:
+            # environments with this value can't be evaluated at all
+            continue
+        groups.setdefault(signature, value)
+    return list(groups.values())
+
+
+def _get_version_candidates(leaves: Set[BaseMarker]) -> List[str]:
+    """Get versions from leaves and one version from every interval between them.
+    """
+    # external
+    from packaging.version import Version
+
+    bounds = dict()  # type: Dict[Version, str]
+    for leaf in leaves:
+        version = getattr(leaf, 'version', None)
+        if isinstance(version, Version):
+            bounds.setdefault(version, leaf.value)
+        domain = get_domain(leaf)
+        if isinstance(domain, VersionDomain):
+            for low, _, high, _ in domain.intervals:
+                for bound in (low, high):
+                    if bound is not None:
+                        bounds.setdefault(bound, str(bound))
+
+    versions = sorted(bounds)
+    # the given versions go first, so they are chosen as representatives of groups
+    candidates = [bounds[version] for version in versions]
+    for low, high in zip([None] + versions, versions + [None]):    # type: ignore
+        between = _get_between(low, high)
+        if between is not None:
+            candidates.append(between)
+    return candidates
+
+
+def _get_between(low: Optional['Version'], high: Optional['Version']) -> Optional[str]:
+    """Get a short version that is between the given versions.
+    """
+    # external
+    from packaging.version import Version
+
+    if low is None and high is None:
+        return '0'
+    candidates = []
+    if low is None:
+        epoch = high.epoch  # type: ignore
+        release = high.release  # type: ignore
+        # decrement the last non-zero part: `2.7` -> `2.6`, `3.0` -> `2`
+        for index in reversed(range(len(release))):
+            if release[index]:
+                candidates.append(release[:index] + (release[index] - 1, ))
+                break
+    else:
+        epoch = low.epoch
+        release = low.release
+        # increment the last part: `3.6` -> `3.7`, then try `3.6.1` and `3.6.0.1`
+        candidates.append(release[:-1] + (release[-1] + 1, ))
+        candidates.append(release + (1, ))
+        candidates.append(release + (0, 1))
+
+    # `1!2.0` is greater than any version without epoch, so the epoch is kept
+    prefix = '{}!'.format(epoch) if epoch else ''
+    values = [prefix + '.'.join(map(str, candidate)) for candidate in candidates]
+    if epoch and low is None:
+        # `1!0` has no smaller version in the same epoch
+        values.append('0')
+    for value in values:
+        version = Version(value)
+        if low is not None and version <= low:
+            continue
+        if high is not None and version >= high:
+            continue
+        return value
+    return None
@@ -0,0 +1,199 @@
+# built-in
+import io
+import os
+import re
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple, Union
+
+# app
+from ._markers import Markers
+
+
+if TYPE_CHECKING:
+    # built-in
+    from pathlib import Path
+
+
+# path to the file, opened file, or lines
+Source = Union[str, 'Path', IO, Iterable[str]]
+# archives need random access, so they can't be read from lines
+ArchiveSource = Union[str, 'Path', IO]
+Pair = Tuple[str, Markers]
+
+# `markers = "..."` or `marker = '...'` in TOML
+REX_TOML_MARKERS = re.compile(r"""\bmarkers?\s*=\s*(?:"((?:[^"\\]|\\.)*)"|'([^']*)')""")
+# `name = ...` in TOML
+REX_TOML_KEY = re.compile(r"""^\s*["']?([A-Za-z0-9_.\-]+)["']?\s*=\s*(.*)$""")
+TOML_ESCAPES = {'"': '"', '\\': '\\', 'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+
+@contextmanager
+def _open_text(source: Source) -> Iterator[Iterable[str]]:
+    if isinstance(source, io.TextIOBase):
+        yield source
+    elif hasattr(source, 'read'):
+        # binary stream
+        yield io.TextIOWrapper(source, encoding='utf8')  # type: ignore
+    elif isinstance(source, (str, os.PathLike)):
+        with open(str(source), encoding='utf8') as stream:
+            yield stream
+    else:
+        # any other iterable of lines
+        yield source    # type: ignore
+
+
+def split_requirement(line: str) -> Tuple[str, str]:
+    """Split PEP-508 requirement into the requirement itself and the markers string.
+    """
+    requirement, sep, markers = line.partition(';')
+    if sep and '@' in requirement:
+        # `;` is allowed in URL, the markers separator must be preceded by whitespace
+        match = re.search(r'\s;', line)
+        if match is None:
+            return line.strip(), ''
+        requirement, markers = line[:match.start()], line[match.end():]
+    return requirement.strip(), markers.strip()
+
+
+def read_metadata(source: Source) -> Iterator[Pair]:
+    """Get requirements with markers from `Requires-Dist` fields of METADATA or PKG-INFO.
+
+    The file is read line by line and only until the end of headers,
+    requirements without markers are skipped.
+    """
+    with _open_text(source) as stream:
+        field = None    # type: Optional[str]
+        for line in stream:
+            # folded header
+            if line[:1] in (' ', '\t') and field is not None:
+                field += ' ' + line.strip()
+                continue
+            if field is not None:
+                pair = _parse_requires_dist(field)
+                if pair is not None:
+                    yield pair
+                field = None
+            if not line.strip():
+                # the end of headers, the description goes next
+                return
+            if line[:14].lower() == 'requires-dist:':
+                field = line[14:].strip()
+        if field is not None:
+            pair = _parse_requires_dist(field)
+            if pair is not None:
+                yield pair
+
+
+def _parse_requires_dist(value: str) -> Optional[Pair]:
+    requirement, markers = split_requirement(value)
+    if not markers:
+        return None
+    return requirement, Markers(markers)
+
+
+def read_wheel(source: ArchiveSource) -> Iterator[Pair]:
+    """Get requirements with markers from METADATA of the wheel without extracting it.
+
+    The source is a path or an opened binary file, but not lines.
+    """
+    # lazy import, the module isn't needed until wheels are read
+    import zipfile
+
+    if not hasattr(source, 'read'):
+        source = str(source)
+    with zipfile.ZipFile(source) as archive:
+        for name in archive.namelist():
+            parts = name.split('/')
+            if len(parts) == 2 and parts[0].endswith('.dist-info') and parts[1] == 'METADATA':
+                with archive.open(name) as stream:
+                    yield from read_metadata(stream)
+                return
+
+
+def read_poetry_lock(source: Source) -> Iterator[Pair]:
+    """Get packages and dependencies with markers from poetry.lock.
+
+    The file is read line by line without parsing TOML. For package-level markers
+    the package name is yielded, for dependencies the dependency name is yielded.
+    """
+    with _open_text(source) as stream:
+        section = ''
+        package = None      # type: Optional[str]
+        package_markers = []  # type: List[str]
+        dependency = None   # type: Optional[str]
+        for line in stream:
+            stripped = line.strip()
+            if stripped.startswith('['):
+                if stripped == '[[package]]' or not stripped.startswith('[package'):
+                    # the previous package is over
+                    if package is not None:
+                        for markers in package_markers:
+                            yield package, Markers(markers)
+                    package = None
+                    package_markers = []
+                section = stripped
+                dependency = None
+                continue
+
+            if section == '[[package]]':
+                match = REX_TOML_KEY.match(line)
+                if match is None:
+                    continue
+                if match.group(1) == 'name':
+                    package = _unquote(match.group(2))
+                elif match.group(1) in ('marker', 'markers'):
+                    package_markers.extend(_find_markers(line))
+                continue
+
+            if section == '[package.dependencies]':
+                match = REX_TOML_KEY.match(line)
+                if match is not None and not match.group(2).startswith('"'):
+                    dependency = match.group(1)
+                elif match is not None:
+                    # simple version constraint, no markers
+                    dependency = None
+                if dependency is not None:
+                    for markers in _find_markers(line):
+                        yield dependency, Markers(markers)
+
+        if package is not None:
+            for markers in package_markers:
+                yield package, Markers(markers)
+
+
+def read_pipfile_lock(source: Source) -> Iterator[Pair]:
+    """Get packages with markers from Pipfile.lock.
+
+    It's a single JSON document, so the whole file is loaded but markers are parsed lazily.
+    The requirement is the package name with the locked version.
+    """
+    # lazy import, the module isn't needed until lockfiles are read
+    import json
+
+    with _open_text(source) as stream:
+        # lines don't have `read`, so the content is joined
+        data = json.loads(''.join(stream))
+    for section in ('default', 'develop'):
+        for name, info in (data.get(section) or {}).items():
+            markers = info.get('markers')
+            if markers:
+                yield name + info.get('version', ''), Markers(markers)
+
+
+def _find_markers(line: str) -> Iterator[str]:
+    for match in REX_TOML_MARKERS.finditer(line):
+        if match.group(1) is not None:
+            yield _unescape(match.group(1))
+        else:
+            yield match.group(2)
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r'\\(.)', lambda match: TOML_ESCAPES.get(match.group(1), match.group(0)), value)
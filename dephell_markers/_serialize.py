@@ -0,0 +1,144 @@
+# built-in
+from typing import Dict, List, Optional, Tuple, Union
+
+# app
+from ._marker import BaseMarker, StringMarker, VersionMarker
+from ._operation import AndMarker, Operation, OrMarker
+
+
+Node = Union[Operation, BaseMarker]
+
+# format: magic, version, strings table, nodes in prefix order
+MAGIC = b'DM\x01'
+
+# node tags
+EMPTY = 0
+STRING = 1
+VERSION = 2
+AND = 3
+OR = 4
+
+LEAVES = {STRING: StringMarker, VERSION: VersionMarker}
+OPERATIONS = {AND: AndMarker, OR: OrMarker}
+TAGS = {StringMarker: STRING, VersionMarker: VERSION, AndMarker: AND, OrMarker: OR}
+
+# strings that are never stored in the table. Append only, order is a part of the format.
+BUILTIN_STRINGS = (
+    '<', '<=', '==', '!=', '>=', '>', '~=', '===', 'in', 'not in',
+    'implementation_name', 'implementation_version', 'os_name', 'platform_machine',
+    'platform_python_implementation', 'platform_release', 'platform_system',
+    'platform_version', 'python_full_version', 'python_version', 'sys_platform', 'extra',
+)
+BUILTIN_INDEX = {string: index for index, string in enumerate(BUILTIN_STRINGS)}
+
+
+def dumps(node: Optional[Node]) -> bytes:
+    """Encode the tree into compact binary form.
+
+    Every string is stored only once, nodes refer to strings by index.
+    Variables and operators are built-in and aren't stored at all.
+    All numbers are varints, so most of them take one byte.
+    """
+    strings = dict(BUILTIN_INDEX)
+    body = bytearray()
+    if node is None:
+        body.append(EMPTY)
+    else:
+        _dump_node(node, body, strings)
+
+    result = bytearray(MAGIC)
+    _dump_int(len(strings) - len(BUILTIN_STRINGS), result)
+    for string in sorted(strings, key=strings.__getitem__)[len(BUILTIN_STRINGS):]:
+        encoded = string.encode('utf8')
+        _dump_int(len(encoded), result)
+        result += encoded
+    result += body
+    return bytes(result)
+
+
+def loads(data: bytes) -> Optional[Node]:
+    """Decode the tree from `dumps` result.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('invalid markers data: unknown format')
+    try:
+        count, position = _load_int(data, len(MAGIC))
+        strings = list(BUILTIN_STRINGS)
+        for _ in range(count):
+            size, position = _load_int(data, position)
+            strings.append(data[position:position + size].decode('utf8'))
+            position += size
+        node, position = _load_node(data, position, strings)
+    except (IndexError, KeyError, UnicodeDecodeError) as exc:
+        raise ValueError('invalid markers data: {}'.format(exc)) from exc
+    if position != len(data):
+        raise ValueError('invalid markers data: unexpected trailing bytes')
+    return node
+
+
+def _dump_node(node: Node, buffer: bytearray, strings: Dict[str, int]) -> None:
+    tag = TAGS[type(node)]
+    buffer.append(tag)
+    if isinstance(node, BaseMarker):
+        buffer.append(node.layout)
+        for string in (node.variable, node.operator, node.value):
+            index = strings.get(string)
+            if index is None:
+                index = strings[string] = len(strings)
+            _dump_int(index, buffer)
+        return
+    _dump_int(len(node.nodes), buffer)
+    for child in node.nodes:
+        _dump_node(child, buffer, strings)
+
+
+def _load_node(data: bytes, position: int, strings: List[str]) -> Tuple[Optional[Node], int]:
+    tag = data[position]
+    position += 1
+    if tag == EMPTY:
+        return None, position
+
+    leaf_cls = LEAVES.get(tag)
+    if leaf_cls is not None:
+        layout = data[position]
+        variable, position = _load_int(data, position + 1)
+        operator, position = _load_int(data, position)
+        value, position = _load_int(data, position)
+        node = leaf_cls.from_parts(
+            variable=strings[variable],
+            operator=strings[operator],
+            value=strings[value],
+            layout=layout,
+        )
+        return node, position
+
+    count, position = _load_int(data, position)
+    nodes = []
+    for _ in range(count):
+        child, position = _load_node(data, position, strings)
+        if child is None:
+            raise ValueError('invalid markers data: empty node in operation')
+        nodes.append(child)
+    return OPERATIONS[tag](*nodes), position
+
+
+def _dump_int(number: int, buffer: bytearray) -> None:
+    while number > 0x7F:
+        buffer.append((number & 0x7F) | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+def _load_int(data: bytes, position: int) -> Tuple[int, int]:
+    byte = data[position]
+    if byte < 0x80:
+        return byte, position + 1
+    number = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
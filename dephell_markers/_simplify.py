@@ -0,0 +1,189 @@
+# built-in
+from typing import Dict, List, Union
+
+# app
+from ._domain import Domain, get_domain
+from ._marker import BaseMarker, VersionMarker
+from ._operation import AndMarker, Operation, OrMarker
+
+
+# canonical form of markers that never match
+NEVER = 'os_name == "" and os_name != ""'
+
+# operators that can be merged by `VersionMarker.__add__`
+MERGEABLE = {'<', '<=', '==', '>=', '>'}
+
+Node = Union[Operation, BaseMarker]
+
+
+def simplify(node: Node) -> Union[Node, bool]:
+    """Get equivalent node in the simplified canonical form.
+
+    Returns True if the node always matches and False if it never matches.
+    """
+    if isinstance(node, BaseMarker):
+        return node
+
+    is_and = isinstance(node, AndMarker)
+    nodes = []  # type: List[Node]
+    for child in node.nodes:
+        child = simplify(child)
+        if child is (not is_and):
+            # `x and False` or `x or True`
+            return not is_and
+        if child is is_and:
+            # `x and True` or `x or False`
+            continue
+        if type(child) is type(node):
+            nodes.extend(child.nodes)   # type: ignore
+        else:
+            nodes.append(child)         # type: ignore
+
+    domains = _get_domains(nodes, is_and=is_and)
+    for domain in domains.values():
+        if is_and and domain.is_empty:
+            return False
+        if not is_and and domain.is_full:
+            return True
+
+    nodes = _absorb(nodes, is_and=is_and)
+    if is_and:
+        nodes = _merge_versions(nodes)
+
+    if not nodes:
+        return is_and
+    if len(nodes) == 1:
+        return nodes[0]
+    nodes.sort(key=_sort_key)
+    if is_and:
+        return AndMarker(*nodes)
+    return OrMarker(*nodes)
+
+
+def implies(left: Union[Node, bool], right: Union[Node, bool]) -> bool:
+    """Check if the left node implies the right one.
+
+    It's a fast structural check: True means that the left node implies
+    the right one but False means only that it isn't proven.
+    """
+    if left is False or right is True:
+        return True
+    if left is True or right is False:
+        return False
+    if isinstance(left, OrMarker):
+        return all(implies(node, right) for node in left.nodes)
+    if isinstance(right, AndMarker):
+        return all(implies(left, node) for node in right.nodes)
+    if isinstance(right, OrMarker):
+        if any(implies(left, node) for node in right.nodes):
+            return True
+    if isinstance(left, AndMarker):
+        return any(implies(node, right) for node in left.nodes)
+    if isinstance(left, BaseMarker) and isinstance(right, BaseMarker):
+        return _leaf_implies(left, right)
+    return False
+
+
+def _leaf_implies(left: BaseMarker, right: BaseMarker) -> bool:
+    if _leaf_key(left) == _leaf_key(right):
+        return True
+    if left.variable != right.variable:
+        return False
+    left_domain = get_domain(left)
+    right_domain = get_domain(right)
+    if left_domain is None or right_domain is None:
+        return False
+    if type(left_domain) is not type(right_domain):
+        return False
+    return left_domain.issubset(right_domain)   # type: ignore
+
+
+def _get_domains(nodes: List[Node], is_and: bool) -> Dict[str, Domain]:
+    """Intersect (for `and`) or unite (for `or`) domains of all leafs by variable.
+    """
+    domains = dict()  # type: Dict[str, Domain]
+    for node in nodes:
+        if not isinstance(node, BaseMarker):
+            continue
+        domain = get_domain(node)
+        if domain is None:
+            continue
+        old = domains.get(node.variable)
+        if old is None:
+            domains[node.variable] = domain
+        elif type(old) is type(domain):
+            if is_and:
+                domains[node.variable] = old.intersect(domain)  # type: ignore
+            else:
+                domains[node.variable] = old.union(domain)      # type: ignore
+    return domains
+
+
+def _absorb(nodes: List[Node], is_and: bool) -> List[Node]:
+    """Drop redundant nodes.
+
+    For `and` it drops nodes implied by other ones (`a and (a or b)` -> `a`),
+    for `or` it drops nodes that imply other ones (`a or (a and b)` -> `a`).
+    Duplicates are dropped as well.
+    """
+    result = []  # type: List[Node]
+    for node in nodes:
+        if is_and:
+            if any(implies(old, node) for old in result):
+                continue
+            result = [old for old in result if not implies(node, old)]
+        else:
+            if any(implies(node, old) for old in result):
+                continue
+            result = [old for old in result if not implies(old, node)]
+        result.append(node)
+    return result
+
+
+def _merge_versions(nodes: List[Node]) -> List[Node]:
+    """Merge version markers for the same variable (`>=2.7 and <=2.7` -> `==2.7`).
+    """
+    result = []  # type: List[Node]
+    for node in nodes:
+        if not _is_mergeable(node):
+            result.append(node)
+            continue
+        for index, old in enumerate(result):
+            if not _is_mergeable(old) or old.variable != node.variable:  # type: ignore
+                continue
+            merged = old.__add__(node)  # type: ignore
+            if merged is not NotImplemented:
+                result[index] = merged
+                break
+        else:
+            result.append(node)
+    return result
+
+
+def _is_mergeable(node: Node) -> bool:
+    if not isinstance(node, VersionMarker):
+        return False
+    if node.operator not in MERGEABLE:
+        return False
+    return get_domain(node) is not None
+
+
+def _leaf_key(node: BaseMarker) -> tuple:
+    return node._key
+
+
+def _sort_key(node: Node) -> tuple:
+    # single markers go first, sorted by variable
+    if isinstance(node, BaseMarker):
+        return (0, node.variable, _version_key(node), str(node))
+    return (1, '', (), str(node))
+
+
+def _version_key(node: BaseMarker) -> tuple:
+    if not isinstance(node, VersionMarker):
+        return ()
+    domain = get_domain(node)
+    if domain is None:
+        return ()
+    # sort versions by value, not as strings
+    return tuple(node.version.release)
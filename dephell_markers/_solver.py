@@ -0,0 +1,80 @@
+# built-in
+from typing import Dict, List, Optional, Tuple, Union
+
+# app
+from ._domain import Domain, get_domain
+from ._marker import BaseMarker
+from ._operation import AndMarker, Operation
+
+
+Node = Union[Operation, BaseMarker]
+Goal = Tuple[Node, bool]  # node and is it positive (False for negated node)
+
+
+def is_satisfiable(node: Optional[Node]) -> bool:
+    """Check if there is an environment that matches the node.
+
+    Every variable has a domain of possible values, and every single marker
+    narrows it. `or` nodes are solved by backtracking over their children.
+    Variables are independent, and single markers that can't be represented
+    as a domain are considered always satisfiable, so the result errs on the side
+    of True: False means that the node never matches.
+    """
+    if node is None:
+        return True
+    return _solve([(node, True)], dict())
+
+
+def implies(left: Optional[Node], right: Optional[Node]) -> bool:
+    """Check if every environment that matches the left node matches the right one.
+    """
+    if right is None:
+        return True
+    goals = [(right, False)]    # type: List[Goal]
+    if left is not None:
+        goals.append((left, True))
+    return not _solve(goals, dict())
+
+
+def is_disjoint(left: Optional[Node], right: Optional[Node]) -> bool:
+    """Check if there is no environment that matches both nodes.
+    """
+    goals = [(node, True) for node in (left, right) if node is not None]  # type: List[Goal]
+    return not _solve(goals, dict())
+
+
+def _solve(goals: List[Goal], domains: Dict[str, Domain]) -> bool:
+    branches = []   # type: List[Goal]
+    while goals:
+        node, positive = goals.pop()
+        if isinstance(node, BaseMarker):
+            domain = get_domain(node)
+            if domain is None:
+                continue
+            if not positive:
+                domain = domain.complement()
+            old = domains.get(node.variable)
+            if old is not None:
+                if type(old) is not type(domain):
+                    continue
+                domain = old.intersect(domain)  # type: ignore
+            if domain.is_empty:
+                return False
+            domains[node.variable] = domain
+            continue
+
+        # `a and b` and `not (a or b)` are conjunctions
+        if isinstance(node, AndMarker) is positive:
+            goals.extend((child, positive) for child in node.nodes)
+        else:
+            branches.append((node, positive))
+
+    if not branches:
+        return True
+    # try the narrowest disjunction first, the rest are solved recursively
+    branches.sort(key=lambda goal: len(goal[0].nodes))  # type: ignore
+    (node, positive), rest = branches[0], branches[1:]
+    for child in node.nodes:    # type: ignore
+        if _solve(rest + [(child, positive)], dict(domains)):
+            return True
+    return False
@@ -0,0 +1,49 @@
+# built-in
+from typing import List, Union
+
+# app
+from ._evaluate import Environment
+from ._marker import BaseMarker
+from ._operation import AndMarker, Operation
+
+
+Node = Union[Operation, BaseMarker]
+
+
+def specialize(node: Node, environment: Environment) -> Union[Node, bool]:
+    """Get the node with all single markers for known variables replaced by their results.
+
+    Returns True if the node matches every environment with the given values,
+    False if it matches none of them, and the residual node otherwise.
+    Untouched subtrees are shared with the given node.
+    """
+    if isinstance(node, BaseMarker):
+        # comparison of two variables compares the left one with the name
+        # of the right one, like `BaseMarker.compile` and packaging do
+        if node.variable not in environment:
+            return node
+        return node._predicate()(environment[node.variable])
+
+    is_and = isinstance(node, AndMarker)
+    nodes = []  # type: List[Node]
+    changed = False
+    for child in node.nodes:
+        new = specialize(child, environment)
+        if new is (not is_and):
+            # `x and False` or `x or True`
+            return not is_and
+        if new is is_and:
+            # `x and True` or `x or False`
+            changed = True
+            continue
+        if new is not child:
+            changed = True
+        nodes.append(new)   # type: ignore
+
+    if not changed:
+        return node
+    if not nodes:
+        return is_and
+    if len(nodes) == 1:
+        return nodes[0]
+    return type(node)(*nodes)
@@ -0,0 +1,77 @@
+# built-in
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
+
+
+if TYPE_CHECKING:
+    # external
+    from dephell_specifier import Specifier
+    from packaging.version import Version
+
+
+# A lock has only a few dozen distinct versions, so parsed versions and specifiers
+# are shared between all markers and environments with the same literal.
+CACHE_SIZE = 4096
+
+# epoch and release without trailing zeros
+VersionKey = Tuple[int, Tuple[int, ...]]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_version(value: str) -> Optional['Version']:
+    """Get PEP-440 version or None if the value isn't a valid version.
+    """
+    # external
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        return Version(value)
+    except InvalidVersion:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_any_version(value: str):
+    """Get PEP-440 version or legacy version, like `packaging.version.parse` does.
+    """
+    # external
+    from packaging.version import parse
+
+    return parse(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def get_version_key(value: str) -> Optional[VersionKey]:
+    """Get comparable key of the final release.
+
+    Keys of final releases are compared in the same way as versions but much faster.
+    Returns None for invalid versions and for pre-, post-, dev- and local versions.
+    """
+    version = parse_version(value)
+    if version is None:
+        return None
+    if version.pre is not None or version.post is not None or version.dev is not None:
+        return None
+    if version.local is not None:
+        return None
+    release = version.release
+    # `3.6` is the same as `3.6.0`
+    end = len(release)
+    while end > 1 and release[end - 1] == 0:
+        end -= 1
+    return (version.epoch, release[:end])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def get_specifier(operator: str, value: str) -> 'Specifier':
+    """Get `dephell_specifier.Specifier`. It's shared, so it must never be changed.
+    """
+    # external
+    from dephell_specifier import Specifier
+
+    return Specifier(operator + value)
+
+
+def clear_caches() -> None:
+    for func in (parse_version, parse_any_version, get_version_key, get_specifier):
+        func.cache_clear()
@@ -0,0 +1,76 @@
+# built-in
+from itertools import product
+
+# external
+import pytest
+
+# project
+from dephell_markers import BDD, Markers
+
+
+ENVIRONMENTS = [
+    dict(os_name=os_name, sys_platform=platform, python_version=version, extra=extra)
+    for os_name, platform, version, extra in product(
+        ['posix', 'nt'],
+        ['linux', 'win32', 'linux2'],
+        ['2.7', '3.5', '3.6', '3.6.2', '3.7', '3.8', '4.0'],
+        ['', 'dev'],
+    )
+]
+
+
+@pytest.mark.parametrize('left, right', [
+    ('os_name == "nt" and python_version < "3"', 'python_version < "3" and "nt" == os_name'),
+    ('python_version <= "3.6" and python_version >= "3.6"', 'python_version == "3.6"'),
+    ('python_version < "3" or python_version >= "3"', ''),
+    ('python_version ~= "3.6.1"', 'python_version >= "3.6.1" and python_version < "3.7"'),
+    ('os_name == "nt" or os_name != "nt" and extra == "dev"', 'os_name == "nt" or extra == "dev"'),
+    ('"linux" in sys_platform or "linux" not in sys_platform', ''),
+    (
+        '(os_name == "nt" or python_version < "3") and (os_name == "nt" or extra == "dev")',
+        'os_name == "nt" or python_version < "3" and extra == "dev"',
+    ),
+])
+def test_equivalent(left, right):
+    assert BDD().equivalent(left, right)
+
+
+@pytest.mark.parametrize('left, right', [
+    ('os_name == "nt"', 'os_name == "posix"'),
+    ('python_version < "3.6"', 'python_version <= "3.6"'),
+    ('"linux" in sys_platform', 'sys_platform == "linux"'),
+])
+def test_not_equivalent(left, right):
+    assert not BDD().equivalent(left, right)
+
+
+@pytest.mark.parametrize('marker', [
+    'os_name == "nt" and python_version < "3"',
+    'python_version >= "2.7" and python_version != "3.0" and python_version < "3.8"',
+    'os_name == "nt" or sys_platform == "linux" and extra == "dev" or python_version > "3.6"',
+    '"linux" in sys_platform and python_version ~= "3.6.1" or os_name == sys_platform',
+    '"linux" not in sys_platform or extra != "dev" and os_name != "nt"',
+    'os_name == "nt" and os_name == "posix"',
+])
+def test_to_markers(marker):
+    bdd = BDD()
+    node = bdd.from_markers(marker)
+    converted = node.to_markers()
+    negated = (~node).to_markers()
+    for environment in ENVIRONMENTS:
+        expected = Markers(marker).evaluate(environment)
+        assert converted.evaluate(environment) is expected
+        assert negated.evaluate(environment) is not expected
+    assert bdd.from_markers(converted) is node
+
+
+def test_operations():
+    bdd = BDD()
+    nt = bdd.from_markers('os_name == "nt"')
+    old = bdd.from_markers('python_version < "3"')
+    assert (nt | ~nt) is bdd.true
+    assert (nt & ~nt) is bdd.false
+    assert (nt & old) is bdd.from_markers('os_name == "nt" and python_version < "3"')
+    assert (nt | old) is (old | nt)
+    assert bdd.from_markers(None) is bdd.true
+    assert str(bdd.false.to_markers()) == 'os_name == "" and os_name != ""'
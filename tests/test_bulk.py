@@ -0,0 +1,37 @@
+# external
+import pytest
+from packaging.markers import InvalidMarker
+
+# project
+from dephell_markers import Markers, parse_many
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_many(workers):
+    Markers.cache.clear()
+    strings = ['os_name == "nt" and extra == "{}"'.format(index % 50) for index in range(500)]
+    strings[10] = 'os_name === '
+    strings[20] = '"a" == "b"'
+    strings[30] = ''
+    strings[40] = '  os_name == "nt" and extra == "40"  '
+    result = parse_many(strings, workers=workers, chunksize=8)
+
+    assert len(result) == len(strings)
+    assert isinstance(result[10], InvalidMarker)
+    assert isinstance(result[20], LookupError)
+    assert str(result[30]) == ''
+    assert str(result[40]) == 'os_name == "nt" and extra == "40"'
+    assert str(result[41]) == 'os_name == "nt" and extra == "41"'
+    # equal strings share the tree, but not the handle
+    assert result[1] is not result[51]
+    assert result[1]._marker is result[51]._marker
+    # trees are cached
+    assert Markers(strings[41])._marker is result[41]._marker
+
+
+def test_cached():
+    Markers.cache.clear()
+    marker = Markers('os_name == "nt"')
+    result = parse_many(['os_name == "nt"', 'os_name == "posix"'], workers=1)
+    assert result[0]._marker is marker._marker
+    assert str(result[1]) == 'os_name == "posix"'
@@ -0,0 +1,106 @@
+# built-in
+from threading import Thread
+
+# external
+import pytest
+
+# project
+from dephell_markers import Markers, ParseCache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    maxsize = Markers.cache.maxsize
+    Markers.cache.clear()
+    yield
+    Markers.cache.resize(maxsize)
+    Markers.cache.clear()
+
+
+def test_hits_and_misses():
+    Markers('os_name == "posix"')
+    Markers('os_name == "posix"')
+    Markers('  os_name == "posix"\n')
+    Markers('os_name == "nt"')
+    info = Markers.cache.info()
+    assert info.hits == 2
+    assert info.misses == 2
+    assert info.currsize == 2
+
+
+def test_shared_tree():
+    m1 = Markers('os_name == "posix" and extra == "lol"')
+    m2 = Markers('os_name == "posix" and extra == "lol"')
+    assert m1._marker is m2._marker
+
+
+def test_eviction():
+    cache = ParseCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.info().evictions == 1
+
+    cache.resize(1)
+    assert len(cache) == 1
+    assert 'c' in cache
+    assert cache.info().evictions == 2
+
+
+def test_disabled():
+    cache = ParseCache(maxsize=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize('marker', [
+    'os_name == "posix" and extra == "lol"',
+    'os_name == "posix" or extra == "lol"',
+    '(os_name == "posix" or extra == "lol") and python_version >= "3.6"',
+])
+def test_copy_on_write(marker):
+    m1 = Markers(marker)
+    m2 = Markers(marker)
+    m1.remove('extra')
+    assert 'extra' not in str(m1)
+    assert str(m2) == str(Markers(marker))
+    assert 'extra' in str(Markers(marker))
+
+
+def test_copy_on_write_merged():
+    m1 = Markers('os_name == "posix" or extra == "lol"')
+    m2 = Markers('python_version >= "3.6"')
+    m3 = m2 & m1
+    m3.remove('extra')
+    assert 'extra' not in str(m3)
+    assert str(m1) == 'os_name == "posix" or extra == "lol"'
+
+    m1.remove('extra')
+    assert str(m1) == 'os_name == "posix"'
+    assert str(m2 & Markers('os_name == "posix" or extra == "lol"')) == (
+        'python_version >= "3.6" and (os_name == "posix" or extra == "lol")'
+    )
+
+
+def test_threads():
+    markers = ['python_version >= "3.{}"'.format(i) for i in range(20)]
+    Markers.cache.resize(10)
+
+    def parse():
+        for _ in range(50):
+            for marker in markers:
+                assert str(Markers(marker)) == marker
+
+    threads = [Thread(target=parse) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = Markers.cache.info()
+    assert info.currsize == 10
+    assert info.hits + info.misses == 8 * 50 * 20
@@ -0,0 +1,73 @@
+# built-in
+from concurrent.futures import ProcessPoolExecutor
+
+# external
+import pytest
+
+# project
+from dephell_markers import DiskCache, Markers
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(path=tmp_path / 'cache.sqlite3')
+    Markers.disk_cache = cache
+    Markers.cache.clear()
+    yield cache
+    Markers.disk_cache = None
+    Markers.cache.clear()
+    cache.close()
+
+
+def test_markers(disk_cache):
+    m = Markers('os_name == "nt" and python_version >= "3.6"')
+    assert disk_cache.get('os_name == "nt" and python_version >= "3.6"') == m.to_bytes()
+
+    # the next process has the empty memory cache
+    Markers.cache.clear()
+    disk_cache.set('os_name == "nt"', Markers('extra == "fake"').to_bytes())
+    assert str(Markers('os_name == "nt"')) == 'extra == "fake"'
+
+
+def test_version(tmp_path):
+    old = DiskCache(path=tmp_path / 'cache.sqlite3')
+    old.version = '0.0.1'
+    old.set('os_name == "nt"', b'data')
+    new = DiskCache(path=tmp_path / 'cache.sqlite3')
+    assert new.get('os_name == "nt"') is None
+    assert old.get('os_name == "nt"') == b'data'
+
+
+def test_eviction(tmp_path):
+    cache = DiskCache(path=tmp_path / 'cache.sqlite3', maxsize=10)
+    for index in range(300):
+        cache.set('extra == "{}"'.format(index), b'data')
+    assert cache.get('extra == "0"') is None
+    assert cache.get('extra == "299"') == b'data'
+    count = cache._connect().execute('SELECT COUNT(*) FROM markers').fetchone()[0]
+    assert count < 300
+
+
+def test_broken(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    path.write_bytes(b'not a database' * 100)
+    cache = DiskCache(path=path)
+    assert cache.get('os_name == "nt"') is None
+    cache.set('os_name == "nt"', b'data')
+    assert cache.broken
+
+
+def _fill(path: str, start: int) -> int:
+    cache = DiskCache(path=path)
+    for index in range(start, start + 50):
+        cache.set('extra == "{}"'.format(index), Markers('extra == "{}"'.format(index)).to_bytes())
+    return sum(cache.get('extra == "{}"'.format(index)) is not None for index in range(start, start + 50))
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_fill, [path] * 4, range(0, 200, 50)))
+    assert results == [50] * 4
+    cache = DiskCache(path=path)
+    assert Markers.from_bytes(cache.get('extra == "123"')).get_string('extra') == '123'
@@ -0,0 +1,52 @@
+# built-in
+from itertools import product
+
+# external
+import pytest
+from packaging.markers import UndefinedEnvironmentName
+
+# project
+from dephell_markers import Environments, Markers
+
+
+ENVS = [
+    dict(python_version=python, sys_platform=platform, os_name=os_name, extra='')
+    for python, (platform, os_name) in product(
+        ['2.7', '3.5', '3.6', '3.7', '3.8', '3.10'],
+        [('linux', 'posix'), ('win32', 'nt'), ('darwin', 'posix')],
+    )
+]
+
+
+@pytest.mark.parametrize('marker', [
+    '',
+    'os_name == "posix"',
+    'python_version >= "3.6"',
+    'python_version >= "3.6" and sys_platform != "darwin"',
+    'python_version < "3" or sys_platform == "win32"',
+    '(python_version < "3" or python_version >= "3.7") and os_name == "posix"',
+    'python_version in "2.7 3.10" and extra == ""',
+    'os_name == "nt" and os_name == "posix"',
+])
+def test_evaluate_many(marker):
+    m = Markers(marker)
+    expected = [m.evaluate(env) for env in ENVS]
+    assert m.evaluate_many(ENVS) == expected
+    assert m.evaluate_many(Environments(ENVS, fill=False)) == expected
+
+
+def test_columns():
+    envs = Environments(ENVS, fill=False)
+    assert len(envs) == len(ENVS)
+    assert len(envs.column('os_name')) == 2
+    assert len(envs.column('python_version')) == 6
+
+
+def test_empty():
+    assert Markers('os_name == "nt"').evaluate_many([]) == []
+
+
+def test_undefined():
+    envs = Environments([dict(os_name='nt'), dict(sys_platform='linux')], fill=False)
+    with pytest.raises(UndefinedEnvironmentName):
+        Markers('os_name == "nt"').evaluate_many(envs)
@@ -0,0 +1,87 @@
+# external
+import pytest
+from packaging.markers import Marker, UndefinedEnvironmentName
+
+# project
+from dephell_markers import Markers
+
+
+ENV = dict(
+    python_version='3.7',
+    python_full_version='3.7.4',
+    implementation_version='3.7.4',
+    sys_platform='linux',
+    os_name='posix',
+    platform_system='Linux',
+    platform_machine='x86_64',
+    platform_python_implementation='CPython',
+    implementation_name='cpython',
+    platform_release='5.4.0',
+    platform_version='#1 SMP',
+    extra='',
+)
+
+
+@pytest.mark.parametrize('marker, expected', [
+    ('os_name == "posix"', True),
+    ('os_name != "posix"', False),
+    ('"posix" == os_name', True),
+    ('"lin" in sys_platform', True),
+    ('sys_platform in "linux darwin"', True),
+    ('sys_platform not in "win32 cygwin"', True),
+    ('python_version >= "3.6"', True),
+    ('python_version > "3.7"', False),
+    ('python_version == "3.7.0"', True),
+    ('python_version != "3.7"', False),
+    ('python_version ~= "3.6"', True),
+    ('python_version in "2.7 3.7"', True),
+    ('python_version == "3.*"', True),
+    ('"3.8" > python_version', True),
+    ('python_full_version < "3.7.4rc1"', False),
+    ('python_version >= "3.6" and os_name == "nt"', False),
+    ('python_version >= "3.8" or os_name == "posix"', True),
+    ('(python_version < "3" or python_version >= "3.3") and extra == "docs"', False),
+])
+def test_evaluate(marker, expected):
+    assert Markers(marker).evaluate(ENV) is expected
+    assert Markers(marker).compile()(ENV) is expected
+    assert Marker(marker).evaluate(ENV) is expected
+
+
+@pytest.mark.parametrize('version, expected', [
+    ('3.8.0', False),
+    ('3.8.0a1', False),
+    ('3.7.9', True),
+    ('3.7.9.post1', True),
+    ('3.7.9+local', True),
+])
+def test_prereleases(version, expected):
+    marker = 'python_full_version < "3.8"'
+    env = dict(ENV, python_full_version=version)
+    assert Markers(marker).evaluate(env) is expected
+    assert Marker(marker).evaluate(env) is expected
+
+
+def test_extra():
+    m = Markers('extra == "docs"')
+    assert m.evaluate() is False
+    assert m.evaluate(dict(extra='docs')) is True
+
+
+def test_empty():
+    assert Markers().evaluate() is True
+    assert Markers().compile()({}) is True
+
+
+def test_undefined():
+    with pytest.raises(UndefinedEnvironmentName):
+        Markers('os_name == "nt"').compile()({})
+
+
+def test_recompile_after_change():
+    m = Markers('os_name == "nt" or python_version >= "3.8"')
+    assert m.evaluate(ENV) is False
+    m.remove('os_name')
+    assert m.evaluate(ENV) is False
+    m |= Markers('sys_platform == "linux"')
+    assert m.evaluate(ENV) is True
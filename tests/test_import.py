@@ -0,0 +1,29 @@
+# built-in
+import subprocess
+import sys
+
+
+def test_lazy_dependencies():
+    code = '\n'.join([
+        'import sys',
+        'import dephell_markers',
+        'm = dephell_markers.Markers(\'os_name == "nt" and python_version >= "3.6"\')',
+        'm = dephell_markers.Markers.union_all([m, \'extra == "a"\'])',
+        'assert m.variables == {"os_name", "python_version", "extra"}',
+        'heavy = ("packaging.markers", "packaging.specifiers", "pyparsing", "dephell_specifier", "sqlite3")',
+        'print(",".join(name for name in heavy if name in sys.modules))',
+    ])
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ''
+
+
+def test_lazy_attribute():
+    import dephell_markers
+    from dephell_markers._disk_cache import DiskCache
+
+    assert dephell_markers.DiskCache is DiskCache
@@ -0,0 +1,75 @@
+# external
+import pytest
+
+# project
+from dephell_markers import Markers, Metrics
+from dephell_markers._instrument import get_tree_stats
+from dephell_markers._parser import parse
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    Markers.instrumentation.subscribe(metrics)
+    Markers.instrumentation.enable()
+    yield metrics
+    Markers.instrumentation.disable()
+    Markers.instrumentation.unsubscribe(metrics)
+
+
+def test_zero_cost_when_disabled():
+    original = Markers.__dict__['_merge']
+    Markers.instrumentation.enable()
+    assert Markers.__dict__['_merge'] is not original
+    Markers.instrumentation.disable()
+    assert Markers.__dict__['_merge'] is original
+    assert isinstance(Markers.__dict__['_parse'], staticmethod)
+    assert isinstance(Markers.__dict__['_convert'], classmethod)
+
+
+def test_metrics(metrics):
+    # the string isn't used in other tests, so it isn't cached yet
+    marker = Markers('os_name == "some-unique-os" and (python_version >= "3.6" or sys_platform == "linux")')
+    marker |= Markers('os_name == "nt"')
+    str(marker)
+    marker.simplify()
+
+    data = metrics.snapshot()
+    assert data['merge']['count'] == 1
+    assert data['str']['count'] == 1
+    assert data['simplify']['max_nodes'] == 7
+    assert data['parse']['max_depth'] == 3
+    assert data['parse']['max_variables'] == 3
+    assert sum(data['merge']['histogram']) == 1
+    assert len(data['merge']['histogram']) == len(metrics.buckets)
+
+
+def test_errors(metrics):
+    with pytest.raises(Exception):
+        Markers('os_name ==')
+    assert metrics.snapshot()['parse']['errors'] == 1
+
+
+def test_callbacks():
+    events = []
+    callback = Markers.instrumentation.subscribe(events.append)
+    Markers.instrumentation.enable()
+    try:
+        str(Markers('os_name == "nt"'))
+        Markers.instrumentation.unsubscribe(callback)
+        str(Markers('os_name == "nt"'))
+    finally:
+        Markers.instrumentation.disable()
+    assert [event.name for event in events] == ['str']
+    assert events[0].duration >= 0
+    assert events[0].error is None
+
+
+@pytest.mark.parametrize('marker, expected', [
+    ('os_name == "nt"', (1, 1, 1)),
+    ('os_name == "nt" and python_version >= "3.6"', (3, 2, 2)),
+    ('os_name == "nt" and (python_version >= "3.6" or os_name == "posix")', (5, 3, 2)),
+])
+def test_tree_stats(marker, expected):
+    assert tuple(get_tree_stats(parse(marker))) == expected
+    assert tuple(get_tree_stats(Markers())) == (0, 0, 0)
@@ -0,0 +1,101 @@
+# built-in
+import gc
+
+# external
+import pytest
+from packaging.markers import Op, Value, Variable
+
+# project
+from dephell_markers import AndMarker, Markers, OrMarker, StringMarker
+from dephell_markers._parser import parse
+
+
+@pytest.fixture
+def interning():
+    Markers.intern_table.enable()
+    yield Markers.intern_table
+    Markers.intern_table.disable()
+    Markers.intern_table.clear()
+
+
+def test_interned_nodes(interning):
+    first = parse('os_name == "nt" and (extra == "a" or extra == "b")')
+    second = parse('os_name == "nt" and (extra == "a" or extra == "b")')
+    assert first is second
+    assert parse('extra == "b" or extra == "a"') in first.nodes
+    assert parse('extra == "a"') is first.nodes[1].nodes[0]
+
+
+def test_order_is_kept(interning):
+    first = parse('os_name == "nt" and (extra == "a" or extra == "b")')
+    second = parse('(extra == "b" or extra == "a") and os_name == "nt"')
+    assert first == second
+    assert first is not second
+    assert first.nodes[0] is second.nodes[1]
+    assert str(Markers('os_name == "nt" and extra == "a"')) == 'os_name == "nt" and extra == "a"'
+    assert str(Markers('extra == "a" and os_name == "nt"')) == 'extra == "a" and os_name == "nt"'
+    assert parse('os_name == "nt"') == parse('"nt" == os_name')
+    assert str(Markers('"nt" == os_name')) == '"nt" == os_name'
+
+
+def test_nested_order_is_kept(interning):
+    first = Markers('os_name == "nt" and (extra == "a" or extra == "b")')
+    second = Markers('os_name == "nt" and (extra == "b" or extra == "a")')
+    assert first._marker == second._marker
+    assert first._marker is not second._marker
+    assert first._marker.nodes[0] is second._marker.nodes[0]
+    assert str(first) == 'os_name == "nt" and (extra == "a" or extra == "b")'
+    assert str(second) == 'os_name == "nt" and (extra == "b" or extra == "a")'
+
+
+def test_weak_references(interning):
+    parse('os_name == "nt" and extra == "some-unique-extra"')
+    gc.collect()
+    assert not any('some-unique-extra' in str(key) for key in interning._nodes.keys())
+
+
+def test_disabled():
+    first = parse('os_name == "nt"')
+    second = parse('os_name == "nt"')
+    assert first is not second
+    assert first == second
+
+
+def test_remove_does_not_change_interned(interning):
+    m1 = Markers('os_name == "nt" or extra == "a"')
+    Markers.cache.clear()
+    m2 = Markers('os_name == "nt" or extra == "a"')
+    assert m1._marker is m2._marker
+    m1.remove('extra')
+    assert str(m1) == 'os_name == "nt"'
+    assert str(m2) == 'os_name == "nt" or extra == "a"'
+
+
+@pytest.mark.parametrize('left, right', [
+    ('os_name == "nt" and extra == "a"', 'extra == "a" and os_name == "nt"'),
+    ('os_name == "nt" or extra == "a"', 'extra == "a" or os_name == "nt"'),
+    ('os_name == "nt"', '"nt" == os_name'),
+])
+def test_hash(left, right):
+    left = parse(left)
+    right = parse(right)
+    assert left == right
+    assert hash(left) == hash(right)
+
+
+@pytest.mark.parametrize('left, right', [
+    ('"win" in sys_platform', 'sys_platform in "win"'),
+    ('os_name == "nt" and extra == "a"', 'os_name == "nt" or extra == "a"'),
+    ('os_name == "nt"', 'os_name != "nt"'),
+])
+def test_not_equal(left, right):
+    assert parse(left) != parse(right)
+
+
+def test_constructors(interning):
+    def make():
+        return StringMarker(lhs=Variable('os_name'), op=Op('=='), rhs=Value('nt'))
+    assert make() is make()
+    assert AndMarker(make(), parse('extra == "a"')) is AndMarker(make(), parse('extra == "a"'))
+    assert AndMarker(make(), parse('extra == "a"')) == AndMarker(parse('extra == "a"'), make())
+    assert OrMarker(make(), parse('extra == "a"')) is not AndMarker(parse('extra == "a"'), make())
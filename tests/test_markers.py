@@ -149,6 +149,10 @@ def test_or(left, right, expected):
     ('os_name == "nt" and os_name != "nt"', {'os_name'}),
     ('os_name == "nt" and os_name != "unix"', {'os_name'}),
     ('os_name == "nt" and os_name == "unix"', {'os_name'}),
+    ('os_name == "nt" and (extra == "a" or python_version >= "3")', {'os_name', 'extra', 'python_version'}),
+    ('(os_name == "nt" or (extra == "a" and sys_platform == "linux")) and os_name != "posix"',
+        {'os_name', 'extra', 'sys_platform'}),
+    ('', set()),
 ])
 def test_variables(marker, expected):
     assert Markers(marker).variables == expected
@@ -194,6 +198,31 @@ def test_remove(before, after):
     assert str(marker) == after
 
 
+def test_remove_shares_subtrees():
+    source = Markers('os_name == "nt" and (extra == "lol" or python_version >= "3.6") and sys_platform == "linux"')
+    copied = source & Markers()
+    kept = source._marker.nodes[0]
+    source.remove('extra')
+    assert str(source) == 'os_name == "nt" and (python_version >= "3.6") and sys_platform == "linux"'
+    assert str(copied) == 'os_name == "nt" and (extra == "lol" or python_version >= "3.6") and sys_platform == "linux"'
+    assert source._marker.nodes[0] is kept
+
+    tree = source._marker
+    source.remove('platform_release')
+    assert source._marker is tree
+
+
+def test_wide_lookups():
+    extras = ['extra == "e{}"'.format(i) for i in range(500)]
+    m = Markers('python_version >= "3.6" and (' + ' or '.join(extras) + ')')
+    assert m.get_version('python_version') == '>=3.6'
+    assert m.get_string('extra') is None
+    assert len(m.get_strings('extra')) == 500
+    assert m.compat
+    # the index belongs to the immutable node and is reused
+    assert m._marker._leaves is m._marker._leaves
+
+
 def test_empty():
     m = Markers()
     assert str(m) == ''
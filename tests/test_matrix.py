@@ -0,0 +1,58 @@
+# built-in
+from itertools import product
+
+# external
+import pytest
+from packaging.markers import UndefinedEnvironmentName
+
+# project
+from dephell_markers import Markers, evaluate_matrix
+from dephell_markers._matrix import has_numpy
+
+
+MARKERS = [
+    'os_name == "nt" and python_version < "3"',
+    'python_version >= "2.7" and python_version != "3.0" and python_version < "3.8"',
+    'os_name == "nt" or sys_platform == "linux" and extra == "dev" or python_full_version > "3.6.1"',
+    '"linux" in sys_platform and python_version ~= "3.6"',
+    None,
+]
+ENVIRONMENTS = [
+    dict(os_name=os_name, sys_platform=platform, python_version=version[:3], python_full_version=version, extra=extra)
+    for os_name, platform, version, extra in product(
+        ['posix', 'nt'],
+        ['linux', 'win32'],
+        ['2.7.18', '3.0.1', '3.6.0', '3.6.2', '3.8.0b1', '3.9.1'],
+        ['', 'dev'],
+    )
+]
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not has_numpy(), reason='numpy is not installed')),
+]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_evaluate_matrix(use_numpy):
+    matrix = evaluate_matrix(MARKERS, ENVIRONMENTS, use_numpy=use_numpy)
+    assert len(matrix) == len(MARKERS)
+    for marker, row in zip(MARKERS, matrix):
+        expected = [Markers(marker).evaluate(environment) for environment in ENVIRONMENTS]
+        assert [bool(value) for value in row] == expected
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_fill(use_numpy):
+    environments = [dict(os_name='nt'), None]
+    matrix = evaluate_matrix(['os_name == "nt" and extra == ""'], environments, use_numpy=use_numpy)
+    assert [bool(value) for value in matrix[0]] == [True, Markers('os_name == "nt"').evaluate()]
+    with pytest.raises(UndefinedEnvironmentName):
+        evaluate_matrix(['extra == "a"'], [dict(extra='a'), dict(os_name='nt')], fill=False, use_numpy=use_numpy)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_empty(use_numpy):
+    assert len(evaluate_matrix([], ENVIRONMENTS, use_numpy=use_numpy)) == 0
+    matrix = evaluate_matrix(['os_name == "nt"'], [], use_numpy=use_numpy)
+    assert len(matrix) == 1
+    assert len(matrix[0]) == 0
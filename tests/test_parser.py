@@ -0,0 +1,57 @@
+# external
+import pytest
+from packaging.markers import InvalidMarker
+
+# project
+from dephell_markers import AndMarker, OrMarker, StringMarker, VersionMarker
+from dephell_markers._parser import parse
+
+
+@pytest.mark.parametrize('given, expected', [
+    ('os_name == "posix"', 'os_name == "posix"'),
+    ("os_name == 'posix'", 'os_name == "posix"'),
+    ('os_name=="posix"', 'os_name == "posix"'),
+    ('"posix" == os_name', '"posix" == os_name'),
+    ('"3.6" <= python_version', 'python_version >= "3.6"'),
+    ('os.name == "nt"', 'os_name == "nt"'),
+    ('python_implementation == "CPython"', 'platform_python_implementation == "CPython"'),
+    ('"win" in sys_platform', '"win" in sys_platform'),
+    ('sys_platform not in "linux darwin"', 'sys_platform not in "linux darwin"'),
+    ('python_version in "2.6 2.7"', '(python_version == "2.6" or python_version == "2.7")'),
+    ('(os_name == "nt")', 'os_name == "nt"'),
+    ('((os_name == "nt"))', 'os_name == "nt"'),
+    ('os_name == "nt" and extra == "a" or extra == "b"', '(os_name == "nt" and extra == "a" or extra == "b")'),
+    ('os_name == "nt" and (extra == "a" or extra == "b")', 'os_name == "nt" and (extra == "a" or extra == "b")'),
+    ('os_name=="nt"and(extra=="a"or extra=="b")', 'os_name == "nt" and (extra == "a" or extra == "b")'),
+])
+def test_parse(given, expected):
+    assert str(parse(given)) == expected
+
+
+def test_node_types():
+    node = parse('os_name == "nt" and (python_version >= "3.6" or extra == "a")')
+    assert isinstance(node, AndMarker)
+    assert isinstance(node.nodes[0], StringMarker)
+    assert isinstance(node.nodes[1], OrMarker)
+    assert isinstance(node.nodes[1].nodes[0], VersionMarker)
+
+
+@pytest.mark.parametrize('given, position', [
+    ('os_name == posix', 'posix'),
+    ('os_name', ''),
+    ('foo == "1"', 'foo == "'),
+    ('os_name == "a" and', 'and'),
+    ('os_name == "a" xor os_name == "b"', 'xor os_n'),
+    ('(os_name == "a"', ''),
+    ('os_name == "a")', ')'),
+    ('os_name not  in "a"', 'not  in '),
+    ('os_name == "a" and  (python_version >= "3" or foo)', 'and  (py'),
+    ('os_name == "a" or (os_name == "b" and', 'or (os_n'),
+    ('os_name == "a\nb"', '"a\nb"'),
+    ("os_name == 'a\rb'", "'a\rb'"),
+])
+def test_invalid(given, position):
+    with pytest.raises(InvalidMarker) as exc_info:
+        parse(given)
+    expected = 'invalid marker: {0!r}, parse error at {1!r}'.format(given, position)
+    assert str(exc_info.value) == expected
@@ -0,0 +1,107 @@
+# built-in
+from itertools import product
+
+# external
+import pytest
+
+# project
+from dephell_markers import Markers, Partition
+
+
+MARKERS = [
+    'python_version >= "3.6" and sys_platform == "win32"',
+    'python_version < "3.8"',
+    'os_name == "nt" or platform_system == "Darwin"',
+    'python_version ~= "3.6.1"',
+    'extra == "dev"',
+    None,
+]
+TARGETS = [
+    dict(os_name=os_name, sys_platform=platform, platform_system=system, python_version=version, extra=extra)
+    for os_name, platform, system, version, extra in product(
+        ['posix', 'nt'],
+        ['linux', 'win32', 'darwin'],
+        ['Linux', 'Windows', 'Darwin'],
+        ['2.7', '3.5', '3.6', '3.7', '3.8', '3.10', '4.0'],
+        ['', 'dev', 'tests'],
+    )
+]
+
+
+def test_classify():
+    partition = Partition(MARKERS)
+    results = [cls.results for cls in partition]
+    assert len(set(results)) == len(results)
+
+    for target in TARGETS:
+        cls = partition.classify(target)
+        assert cls is not None
+        assert cls.results == tuple(Markers(marker).evaluate(target) for marker in MARKERS)
+        expected = tuple(Markers(marker).evaluate(cls.environment) for marker in MARKERS)
+        assert cls.results == expected
+
+
+def test_representatives():
+    partition = Partition(['python_version >= "3.6"', 'python_version < "3.8"', 'sys_platform == "linux"'])
+    assert len(partition) == 6
+    versions = {cls.environment['python_version'] for cls in partition}
+    assert versions == {'3.6', '3.8', '3.5'}
+    platforms = {cls.environment['sys_platform'] for cls in partition}
+    assert platforms == {'linux', 'win32'}
+
+
+@pytest.mark.parametrize('markers, expected', [
+    ([], 1),
+    ([None, ''], 1),
+    (['os_name == "nt"', 'os_name != "nt"'], 2),
+    (['os_name == "nt" or os_name != "nt"'], 1),
+    (['os_name == sys_platform'], 2),
+])
+def test_size(markers, expected):
+    assert len(Partition(markers)) == expected
+
+
+def test_variables_comparison():
+    markers = ['os_name == sys_platform', 'os_name != sys_platform or extra == "dev"']
+    partition = Partition(markers)
+    for cls in partition:
+        assert partition.classify(cls.environment) is cls
+    for os_name, platform in product(['posix', 'nt', 'sys_platform'], ['posix', 'linux', 'win32']):
+        environment = dict(os_name=os_name, sys_platform=platform, extra='')
+        cls = partition.classify(environment)
+        assert cls is not None
+        assert cls.results == tuple(Markers(marker).evaluate(environment) for marker in markers)
+
+
+def test_nodes():
+    markers = [Markers(marker) for marker in MARKERS]
+    expected = Partition(markers)
+    partition = Partition([marker._marker for marker in markers])
+    assert [cls.results for cls in partition] == [cls.results for cls in expected]
+    for target in TARGETS[::7]:
+        assert partition.classify(target) == expected.classify(target)
+
+
+@pytest.mark.parametrize('marker, values', [
+    ('platform_version == "#1 SMP"', ['#1 SMP', '0', '5.4', '']),
+    ('python_version >= "1!2.0"', ['1!2.0', '1!3.0', '3.8', '2!0']),
+    ('python_version < "1!0"', ['1!0', '1!1', '3.8', '0']),
+    ('python_version > "1!2.0" and python_version < "1!2.1"', ['1!2.0', '1!2.0.5', '1!2.1', '2.0.5']),
+])
+def test_covers_values(marker, values):
+    partition = Partition([marker])
+    assert len(partition) == 2
+    for cls in partition:
+        assert partition.classify(cls.environment) is cls
+    variable = marker.split()[0]
+    for value in values:
+        cls = partition.classify({variable: value})
+        assert cls is not None
+        assert cls.results == (Markers(marker).evaluate({variable: value}), )
+
+
+def test_max_classes():
+    markers = ['extra == "{}"'.format(index) for index in range(10)]
+    assert len(Partition(markers)) == 11
+    with pytest.raises(ValueError):
+        Partition(markers + ['os_name == "nt"'], max_classes=20)
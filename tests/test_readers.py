@@ -0,0 +1,131 @@
+# built-in
+import io
+import json
+import zipfile
+from collections import deque
+
+# external
+import pytest
+
+# project
+from dephell_markers import read_metadata, read_pipfile_lock, read_poetry_lock, read_wheel
+from dephell_markers._readers import split_requirement
+
+
+METADATA = """Metadata-Version: 2.1
+Name: example
+Version: 1.0
+Requires-Dist: six
+Requires-Dist: enum34 (>=1.1) ; python_version < "3.4"
+Requires-Dist: pywin32 ; sys_platform == "win32" and
+  python_version >= "3"
+Requires-Dist: pytest ; extra == 'test'
+Provides-Extra: test
+
+Requires-Dist: not-a-header ; os_name == "nt"
+"""
+
+POETRY_LOCK = """
+[[package]]
+category = "main"
+description = "Python 3.4 Enum backported"
+marker = "python_version < \\"3.4\\""
+name = "enum34"
+optional = false
+version = "1.1.6"
+
+[[package]]
+name = "pytest"
+version = "5.0.0"
+markers = 'sys_platform == "linux"'
+
+[package.dependencies]
+six = "*"
+colorama = {version = "*", markers = "sys_platform == \\"win32\\""}
+atomicwrites = [
+    {version = "<1.4", markers = "python_version < \\"3\\""},
+    {version = ">=1.4", markers = "python_version >= \\"3\\""},
+]
+
+[package.extras]
+testing = ["markers == 1"]
+
+[metadata]
+content-hash = "lol"
+"""
+
+PIPFILE_LOCK = {
+    'default': {
+        'six': {'version': '==1.12.0'},
+        'enum34': {'version': '==1.1.6', 'markers': "python_version < '3.4'"},
+    },
+    'develop': {
+        'colorama': {'version': '==0.4.1', 'markers': "sys_platform == 'win32'"},
+    },
+}
+
+
+def _dump(pairs):
+    return [(requirement, str(markers)) for requirement, markers in pairs]
+
+
+METADATA_EXPECTED = [
+    ('enum34 (>=1.1)', 'python_version < "3.4"'),
+    ('pywin32', 'sys_platform == "win32" and python_version >= "3"'),
+    ('pytest', 'extra == "test"'),
+]
+
+
+def test_read_metadata(tmp_path):
+    assert _dump(read_metadata(io.StringIO(METADATA))) == METADATA_EXPECTED
+    path = tmp_path / 'METADATA'
+    path.write_text(METADATA)
+    assert _dump(read_metadata(path)) == METADATA_EXPECTED
+    assert _dump(read_metadata(str(path))) == METADATA_EXPECTED
+    lines = METADATA.splitlines(keepends=True)
+    assert _dump(read_metadata(deque(lines))) == METADATA_EXPECTED
+    assert _dump(read_metadata(line for line in lines)) == METADATA_EXPECTED
+
+
+def test_read_wheel(tmp_path):
+    path = tmp_path / 'example-1.0-py3-none-any.whl'
+    with zipfile.ZipFile(str(path), 'w') as archive:
+        archive.writestr('example/__init__.py', '')
+        archive.writestr('example-1.0.dist-info/METADATA', METADATA)
+    assert _dump(read_wheel(path)) == METADATA_EXPECTED
+    with path.open('rb') as stream:
+        assert _dump(read_wheel(stream)) == METADATA_EXPECTED
+
+
+def test_read_poetry_lock():
+    assert _dump(read_poetry_lock(io.StringIO(POETRY_LOCK))) == [
+        ('enum34', 'python_version < "3.4"'),
+        ('colorama', 'sys_platform == "win32"'),
+        ('atomicwrites', 'python_version < "3"'),
+        ('atomicwrites', 'python_version >= "3"'),
+        ('pytest', 'sys_platform == "linux"'),
+    ]
+
+
+def test_read_pipfile_lock():
+    expected = [
+        ('enum34==1.1.6', 'python_version < "3.4"'),
+        ('colorama==0.4.1', 'sys_platform == "win32"'),
+    ]
+    content = json.dumps(PIPFILE_LOCK, indent=4)
+    assert _dump(read_pipfile_lock(io.StringIO(content))) == expected
+    assert _dump(read_pipfile_lock(content.splitlines(keepends=True))) == expected
+    assert _dump(read_pipfile_lock(iter(content.splitlines(keepends=True)))) == expected
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('six', ('six', '')),
+    ('six>=1 ; os_name == "nt"', ('six>=1', 'os_name == "nt"')),
+    (
+        'six @ https://example.com/six;v=1.whl ; os_name == "nt"',
+        ('six @ https://example.com/six;v=1.whl', 'os_name == "nt"'),
+    ),
+    ('six @ https://example.com/six;v=1.whl', ('six @ https://example.com/six;v=1.whl', '')),
+])
+def test_split_requirement(line, expected):
+    assert split_requirement(line) == expected
@@ -0,0 +1,54 @@
+# project
+from dephell_markers import Markers
+
+
+def test_union_all():
+    markers = Markers.union_all([
+        Markers('os_name == "nt"'),
+        'os_name == "posix" or os_name == "nt"',
+        None,
+        Markers(),
+        Markers('python_version >= "3.6" and extra == "a"'),
+    ])
+    expected = 'os_name == "nt" or os_name == "posix" or python_version >= "3.6" and extra == "a"'
+    assert str(markers) == expected
+
+
+def test_intersection_all():
+    given = ['os_name == "nt"', 'python_version >= "3.6"', 'os_name == "nt"']
+    markers = Markers.intersection_all(Markers(m) for m in given)
+    assert str(markers) == 'os_name == "nt" and python_version >= "3.6"'
+
+
+def test_same_as_loop():
+    given = ['extra == "{}"'.format(i % 7) for i in range(30)]
+    expected = Markers()
+    for marker in given:
+        expected |= Markers(marker)
+    assert str(Markers.union_all(given)) == str(expected)
+
+
+def test_same_as_loop_for_other_container():
+    given = ['os_name == "nt" or extra == "a"', 'extra == "a"']
+    expected = Markers(given[0])
+    expected &= Markers(given[1])
+    assert str(expected) == '(os_name == "nt" or extra == "a") and extra == "a"'
+    assert str(Markers.intersection_all(given)) == str(expected)
+
+    given = ['os_name == "nt" and extra == "a"', 'extra == "a"']
+    expected = Markers(given[0])
+    expected |= Markers(given[1])
+    assert str(Markers.union_all(given)) == str(expected)
+
+
+def test_empty():
+    assert str(Markers.union_all([])) == ''
+    assert str(Markers.union_all(['os_name == "nt"'])) == 'os_name == "nt"'
+
+
+def test_inputs_are_not_mutated():
+    source = Markers('os_name == "nt" and extra == "a"')
+    merged = Markers.union_all([source, 'os_name == "posix"'])
+    source.remove('extra')
+    assert str(source) == 'os_name == "nt"'
+    assert str(merged) == 'os_name == "nt" and extra == "a" or os_name == "posix"'
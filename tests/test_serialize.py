@@ -0,0 +1,57 @@
+# built-in
+import pickle
+from pathlib import Path
+
+# external
+import pytest
+
+# project
+from dephell_markers import AndMarker, Markers, StringMarker
+
+
+CORPUS = Path(__file__).parent.parent / 'benchmarks' / 'corpus.txt'
+
+
+@pytest.mark.parametrize('marker', [
+    '',
+    'os_name == "nt"',
+    '"linux" in sys_platform',
+    'python_version >= "3.6" and (os_name == "nt" or extra == "ünicode")',
+    'python_version in "2.7 3.5 3.6"',
+])
+def test_roundtrip(marker):
+    m = Markers(marker)
+    loaded = Markers.from_bytes(m.to_bytes())
+    assert str(loaded) == str(m)
+    assert loaded._marker == m._marker
+
+
+def test_corpus():
+    for line in CORPUS.read_text().splitlines():
+        if line:
+            m = Markers(line)
+            assert Markers.from_bytes(m.to_bytes())._marker == m._marker
+
+
+def test_compact():
+    m = Markers('python_version >= "3.6" and (os_name == "nt" or "linux" in sys_platform)')
+    assert len(m.to_bytes()) * 2 <= len(str(m))
+
+
+def test_pickle():
+    m = Markers('python_version >= "3.6" and (os_name == "nt" or extra == "a")')
+    assert str(pickle.loads(pickle.dumps(m))) == str(m)
+
+    node = AndMarker(StringMarker.from_parts('os_name', '==', 'nt'), StringMarker.from_parts('extra', '==', 'a'))
+    assert pickle.loads(pickle.dumps(node)) == node
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'XX\x01\x00\x00',
+    b'DM\x01\x00\x03\x02',
+    b'DM\x01\x00\x00\x00',
+])
+def test_invalid(data):
+    with pytest.raises(ValueError):
+        Markers.from_bytes(data)
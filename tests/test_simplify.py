@@ -0,0 +1,90 @@
+# built-in
+from itertools import product
+
+# external
+import pytest
+
+# project
+from dephell_markers import Markers
+
+
+@pytest.mark.parametrize('given, expected', [
+    # absorption
+    ('os_name == "nt" or os_name == "nt" and python_version >= "3"', 'os_name == "nt"'),
+    ('extra == "a" and (extra == "a" or os_name == "nt")', 'extra == "a"'),
+    ('python_version >= "3.6" and (python_version >= "3.5" or os_name == "nt")', 'python_version >= "3.6"'),
+    # version ranges
+    ('python_version >= "3.6" and python_version >= "3.7"', 'python_version >= "3.7"'),
+    ('python_version >= "3.6" or python_version >= "3.7"', 'python_version >= "3.6"'),
+    ('python_version >= "2.7" and python_version <= "2.7"', 'python_version == "2.7"'),
+    ('python_version == "2.7" and python_version != "3.6"', 'python_version == "2.7"'),
+    (
+        'python_version >= "3.10" or python_version == "3.6" or python_version >= "3.8"',
+        'python_version == "3.6" or python_version >= "3.8"',
+    ),
+    (
+        'python_version < "3.10" and python_version != "3.7" and python_version >= "3.6"',
+        'python_version >= "3.6" and python_version != "3.7" and python_version < "3.10"',
+    ),
+    # strings
+    ('os_name == "nt" and os_name != "posix"', 'os_name == "nt"'),
+    ('os_name != "nt" or os_name != "posix"', ''),
+    # contradictions
+    ('python_version < "3" and python_version >= "3.6"', 'os_name == "" and os_name != ""'),
+    ('os_name == "nt" and os_name == "posix"', 'os_name == "" and os_name != ""'),
+    ('os_name == "nt" and os_name == "posix" or extra == "a"', 'extra == "a"'),
+    # tautologies
+    ('os_name == "nt" or os_name != "nt"', ''),
+    ('python_version < "3" or python_version >= "3"', ''),
+    ('python_version <= "3" or python_version != "3"', ''),
+    ('(os_name == "nt" or os_name != "nt") and extra == "a"', 'extra == "a"'),
+    # canonical order
+    (
+        'sys_platform == "linux" and python_version >= "3" or python_version >= "3" and sys_platform == "linux"',
+        'python_version >= "3" and sys_platform == "linux"',
+    ),
+    # nothing to simplify
+    ('"win" in sys_platform or sys_platform in "linux"', '"win" in sys_platform or sys_platform in "linux"'),
+    ('', ''),
+])
+def test_simplify(given, expected):
+    assert str(Markers(given).simplify()) == expected
+
+
+def test_simplify_is_not_inplace():
+    m = Markers('os_name == "nt" or os_name == "nt" and python_version >= "3"')
+    m.simplify()
+    assert str(m) == 'os_name == "nt" or os_name == "nt" and python_version >= "3"'
+
+
+@pytest.mark.parametrize('left, right', [
+    ('os_name == "nt" and extra == "a"', 'extra == "a" and os_name == "nt"'),
+    ('os_name == "nt" or python_version < "3"', 'python_version < "3" or os_name == "nt"'),
+    ('python_version >= "3.10" or python_version < "3"', 'python_version < "3" or python_version >= "3.10"'),
+    (
+        '(os_name == "nt" or extra == "b") and python_version < "3"',
+        'python_version < "3" and (extra == "b" or os_name == "nt")',
+    ),
+])
+def test_canonical(left, right):
+    assert str(Markers(left).simplify()) == str(Markers(right).simplify())
+
+
+def test_equivalent():
+    markers = Markers(
+        '(python_version >= "3.4" and (sys_platform == "linux2" or sys_platform == "linux"))'
+        ' or (python_version >= "3.5" and python_version < "4.0")'
+        ' or (python_version >= "3.6" and sys_platform == "linux")'
+        ' or (os_name == "nt" and os_name == "posix")',
+    )
+    envs = [
+        dict(python_version=python, sys_platform=platform, os_name=os_name)
+        for python, platform, os_name in product(
+            ['2.7', '3.4', '3.5', '3.6', '4.0', '4.1'],
+            ['linux', 'linux2', 'win32'],
+            ['nt', 'posix'],
+        )
+    ]
+    simplified = markers.simplify()
+    assert len(str(simplified)) < len(str(markers))
+    assert simplified.evaluate_many(envs) == markers.evaluate_many(envs)
@@ -0,0 +1,57 @@
+# external
+import pytest
+
+# project
+from dephell_markers import Markers
+
+
+@pytest.mark.parametrize('given, expected', [
+    ('', True),
+    ('python_version >= "3.6"', True),
+    ('python_version < "3" and python_version >= "3.6"', False),
+    ('python_version ~= "2.7" and python_version >= "3"', False),
+    ('os_name == "nt" and os_name == "posix"', False),
+    ('os_name == "nt" and os_name == "posix" or extra == "a"', True),
+    ('(os_name == "nt" or python_version < "3") and os_name == "posix" and python_version >= "3"', False),
+    ('(os_name == "nt" or python_version < "3") and os_name == "posix" and python_version >= "2"', True),
+    # unsupported comparisons are considered satisfiable
+    ('"linux" in sys_platform and "linux" not in sys_platform', True),
+])
+def test_is_satisfiable(given, expected):
+    assert Markers(given).is_satisfiable() is expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('python_version >= "3.6"', 'python_version >= "3"', True),
+    ('python_version >= "3"', 'python_version >= "3.6"', False),
+    ('python_version >= "3.6" and os_name == "nt"', 'os_name == "nt"', True),
+    ('python_version >= "3.6"', 'python_version >= "3" and os_name == "nt"', False),
+    ('os_name == "nt"', 'os_name == "nt" or extra == "a"', True),
+    ('os_name == "nt" or os_name == "posix"', 'os_name != "java"', True),
+    ('python_version == "3.6" or python_version == "3.7"', 'python_version ~= "3.5"', True),
+    ('python_version < "3" and python_version >= "3.6"', 'extra == "a"', True),
+    ('extra == "a"', '', True),
+    ('', 'extra == "a"', False),
+])
+def test_implies(left, right, expected):
+    assert Markers(left).implies(right) is expected
+    assert Markers(left).implies(Markers(right)) is expected
+
+
+@pytest.mark.parametrize('left, right, expected', [
+    ('os_name == "nt" or os_name == "posix"', 'os_name == "java"', True),
+    ('os_name == "nt" or os_name == "posix"', 'os_name != "java"', False),
+    ('python_version < "3"', 'python_version >= "3.6" or os_name == "nt"', False),
+    ('python_version < "3"', 'python_version >= "3.6" and os_name == "nt"', True),
+])
+def test_is_disjoint(left, right, expected):
+    assert Markers(left).is_disjoint(right) is expected
+    assert Markers(right).is_disjoint(left) is expected
+
+
+def test_wide_or():
+    versions = ['3.{}.{}'.format(minor, patch) for minor in range(20) for patch in range(20)]
+    wide = Markers(' or '.join('python_full_version == "{}"'.format(v) for v in versions))
+    assert wide.implies('python_full_version >= "3.0"')
+    assert not wide.implies('python_full_version >= "3.1"')
+    assert wide.is_disjoint('python_full_version >= "4"')
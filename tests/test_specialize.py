@@ -0,0 +1,69 @@
+# external
+import pytest
+
+# project
+from dephell_markers import Markers
+from dephell_markers._parser import parse
+from dephell_markers._specialize import specialize
+
+
+WINDOWS = dict(sys_platform='win32', os_name='nt', platform_system='Windows')
+LINUX = dict(sys_platform='linux', os_name='posix', platform_system='Linux')
+MARKER = (
+    'sys_platform == "win32" and python_version < "3.8" or '
+    'os_name == "posix" and (python_version >= "3.6" or platform_system == "Darwin")'
+)
+
+
+@pytest.mark.parametrize('marker, environment, expected', [
+    (MARKER, WINDOWS, 'python_version < "3.8"'),
+    (MARKER, LINUX, 'python_version >= "3.6"'),
+    (MARKER, dict(WINDOWS, python_version='3.7'), True),
+    (MARKER, dict(WINDOWS, python_version='3.9'), False),
+    (MARKER, dict(LINUX, platform_system='Darwin'), True),
+    (MARKER, {}, MARKER),
+    ('"win32" == sys_platform', WINDOWS, True),
+    ('"win32" != sys_platform', WINDOWS, False),
+    ('os_name == sys_platform and os_name == "nt"', WINDOWS, False),
+    ('os_name == sys_platform and os_name == "nt"', dict(os_name='nt'), False),
+    ('os_name != sys_platform', dict(sys_platform='win32'), 'os_name != sys_platform'),
+    ('', WINDOWS, True),
+])
+def test_specialize(marker, environment, expected):
+    result = Markers(marker).specialize(environment)
+    if isinstance(expected, bool):
+        assert result is expected
+    else:
+        assert str(result) == expected
+
+
+@pytest.mark.parametrize('python_version', ['2.7', '3.5', '3.6', '3.7', '3.8', '3.10'])
+@pytest.mark.parametrize('environment', [WINDOWS, LINUX, dict(LINUX, platform_system='Darwin')])
+def test_same_as_evaluate(environment, python_version):
+    marker = Markers(MARKER)
+    result = marker.specialize(environment)
+    full = dict(environment, python_version=python_version)
+    if not isinstance(result, bool):
+        result = result.evaluate(full)
+    assert result is marker.evaluate(full)
+
+
+@pytest.mark.parametrize('marker', [
+    'os_name == sys_platform',
+    'os_name != sys_platform',
+    'os_name == sys_platform or python_version < "3.6"',
+])
+@pytest.mark.parametrize('environment', [
+    dict(os_name='posix', sys_platform='posix', python_version='3.7'),
+    dict(os_name='nt', sys_platform='win32', python_version='2.7'),
+    dict(os_name='sys_platform', sys_platform='linux', python_version='3.7'),
+])
+def test_variables_comparison(marker, environment):
+    marker = Markers(marker)
+    assert marker.specialize(environment) is marker.evaluate(environment)
+
+
+def test_shares_subtrees():
+    node = parse('os_name == "nt" and (python_version >= "3.6" or python_version < "2.7")')
+    assert specialize(node, dict(sys_platform='linux')) is node
+    assert specialize(node, dict(os_name='nt')) is node.nodes[1]
@@ -45,3 +45,11 @@ def test_merge(left_op, left_val, right_op, right_val, result):
     else:
         merged = lm + rm
         assert str(merged) == result
+
+
+def test_compact():
+    m = StringMarker(lhs=Value('posix'), op=Op('in'), rhs=Variable('os_name'))
+    assert not hasattr(m, '__dict__')
+    assert m == StringMarker.from_parts(variable='os_name', operator='in', value='posix', layout=1)
+    assert str(m) == '"posix" in os_name'
+    assert repr(m) == "StringMarker(lhs=<Value('posix')>, op=<Op('in')>, rhs=<Variable('os_name')>)"
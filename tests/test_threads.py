@@ -0,0 +1,57 @@
+# built-in
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# project
+from dephell_markers import Environments, Markers
+
+
+CORPUS = [
+    line for line in (Path(__file__).parent.parent / 'benchmarks' / 'corpus.txt').read_text().splitlines()
+    if line
+]
+ENVIRONMENTS = [
+    dict(os_name='nt', sys_platform='win32', python_version='2.7', python_full_version='2.7.18'),
+    dict(os_name='posix', sys_platform='linux', python_version='3.6', python_full_version='3.6.15'),
+    dict(os_name='posix', sys_platform='darwin', python_version='3.9', python_full_version='3.9.1'),
+]
+
+
+def _use(marker: Markers, environments: Environments) -> tuple:
+    merged = marker & Markers('extra == "a"')
+    merged |= marker
+    merged.remove('extra')
+    return (
+        str(marker),
+        sorted(marker.variables),
+        marker.get_version('python_version'),
+        marker.get_strings('sys_platform'),
+        marker.evaluate_many(environments),
+        str(marker.simplify()),
+        marker.is_satisfiable(),
+        Markers.from_bytes(marker.to_bytes())._marker == marker._marker,
+        str(merged),
+    )
+
+
+def test_shared_markers():
+    Markers.cache.clear()
+    environments = Environments(ENVIRONMENTS)
+    expected = [_use(Markers(line), environments) for line in CORPUS]
+    # new trees, so lazy properties are computed concurrently
+    shared = [Markers.from_bytes(Markers(line).to_bytes()) for line in CORPUS]
+
+    def job(seed: int) -> list:
+        # every thread walks the shared markers in a different order
+        order = list(range(len(shared)))
+        order = order[seed:] + order[:seed]
+        results = [None] * len(shared)
+        for index in order:
+            results[index] = _use(shared[index], environments)
+        return results
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for results in pool.map(job, range(0, 16 * 7, 7)):
+            assert results == expected
+    # shared markers are not changed
+    assert [str(marker) for marker in shared] == [result[0] for result in expected]
@@ -44,6 +44,11 @@ def test_swap(op, val, expected):
 
     ('<=', '1.2',   '>=', '1.4',    None),
     ('<', '1.2',    '>', '1.2',     None),
+    ('>=', '1.2',   '<', '1.2.0',   None),
+
+    # pre-releases are merged by specifiers
+    ('<', '1.2b1',  '<', '1.4',     '<1.2b1'),
+    ('>=', '1.2b1', '>', '1.2b1',   '>1.2b1'),
 ])
 def test_merge(left_op, left_val, right_op, right_val, result):
     lm = VersionMarker(
@@ -62,3 +67,34 @@ def test_merge(left_op, left_val, right_op, right_val, result):
     else:
         merged = lm + rm
         assert str(merged.specifier) == result
+
+
+def test_compact():
+    m = VersionMarker(lhs=Value('2.7'), op=Op('<'), rhs=Variable('python_version'))
+    assert not hasattr(m, '__dict__')
+    assert m == VersionMarker.from_parts(variable='python_version', operator='>', value='2.7')
+    assert str(m) == 'python_version > "2.7"'
+    assert (type(m.lhs), m.lhs.value, m.op.value, m.rhs.value) == (Variable, 'python_version', '>', '2.7')
+
+
+@pytest.mark.parametrize('value, key', [
+    ('3.6', (0, (3, 6))),
+    ('3.6.0', (0, (3, 6))),
+    ('3', (0, (3, ))),
+    ('3.0.0', (0, (3, ))),
+    ('1!2.0', (1, (2, ))),
+    ('3.6rc1', None),
+    ('3.6.post1', None),
+    ('3.6+local', None),
+    ('lol', None),
+])
+def test_version_key(value, key):
+    m = VersionMarker.from_parts(variable='python_version', operator='>=', value=value)
+    assert m.version_key == key
+
+
+def test_shared_versions():
+    first = VersionMarker.from_parts(variable='python_version', operator='>=', value='3.6')
+    second = VersionMarker.from_parts(variable='python_full_version', operator='>=', value='3.6')
+    assert first.version is second.version
+    assert first.specifier is second.specifier